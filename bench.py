@@ -0,0 +1,359 @@
+"""
+Benchmarks for the DLL implementations in solution.py.
+Run `python bench.py -h` to list the available measurements.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from collections import deque
+from itertools import repeat, starmap
+from random import Random
+from time import perf_counter
+from typing import Callable, Dict, List
+
+from solution import DLL, ArrayDLL, UnrolledDLL, fix_playlist
+
+
+def measure_memory(factory: Callable, n: int) -> int:
+    """
+    Measures the bytes held by a list of n ints built through list_to_dll
+    :param factory: zero-argument callable returning an empty list implementation
+    :param n: number of values to load
+    :return: number of bytes still allocated once the list is built
+    """
+    source = list(range(n))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        dll = factory()
+        dll.list_to_dll(source)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del dll
+    return current
+
+
+def memory(sizes: List[int]) -> None:
+    """
+    Prints bytes per value for the Node-based DLL and the array-backed ArrayDLL
+    :param sizes: list sizes to measure
+    :returns: None
+    """
+    print(f"{'n':>10} {'DLL B/val':>10} {'ArrayDLL B/val':>15} {'ratio':>7}")
+    for n in sizes:
+        node_bytes = measure_memory(DLL, n)
+        array_bytes = measure_memory(ArrayDLL, n)
+        print(f"{n:>10} {node_bytes / n:>10.1f} {array_bytes / n:>15.1f} {node_bytes / array_bytes:>7.2f}")
+
+
+def best_of(func: Callable, repeat: int = 3) -> float:
+    """
+    :param func: zero-argument callable to time
+    :param repeat: number of timed runs
+    :return: fastest wall-clock time of func, in seconds
+    """
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def unrolled(sizes: List[int], capacity: int) -> None:
+    """
+    Prints traversal times and memory of the node-per-value DLL against UnrolledDLL
+    :param sizes: list sizes to measure
+    :param capacity: values per UnrolledDLL block
+    :returns: None
+    """
+    print(f"{'n':>10} {'op':>12} {'DLL s':>10} {'Unrolled s':>11} {'speedup':>8}")
+    for n in sizes:
+        lists = {}
+        for name, factory in (("DLL", DLL), ("Unrolled", lambda: UnrolledDLL(capacity))):
+            first, second = factory(), factory()
+            first.list_to_dll(range(n))
+            second.list_to_dll(range(n))
+            lists[name] = (first, second)
+        ops = {
+            "find (miss)": lambda pair: pair[0].find(-1),
+            "dll_to_list": lambda pair: pair[0].dll_to_list(),
+            "__eq__": lambda pair: pair[0] == pair[1],
+        }
+        for op, run in ops.items():
+            node_time = best_of(lambda: run(lists["DLL"]))
+            block_time = best_of(lambda: run(lists["Unrolled"]))
+            print(f"{n:>10} {op:>12} {node_time:>10.4f} {block_time:>11.4f} {node_time / block_time:>7.1f}x")
+        node_bytes = measure_memory(DLL, n)
+        block_bytes = measure_memory(lambda: UnrolledDLL(capacity), n)
+        print(f"{n:>10} {'B/val':>12} {node_bytes / n:>10.1f} {block_bytes / n:>11.1f} {node_bytes / block_bytes:>7.1f}x")
+
+
+BATCH = 1_000  # push and pop calls timed per run
+NOISE_FLOOR = 1e-4  # seconds; runs this short are too noisy to flag as regressions
+IMPLEMENTATIONS = ("DLL", "deque", "list")
+
+
+def _consume(iterator) -> None:
+    """
+    Runs an iterator to exhaustion at C speed, so timed loops carry no Python loop overhead
+    :param iterator: iterator to drain
+    :returns: None
+    """
+    deque(iterator, maxlen=0)
+
+
+def _build(impl: str, n: int):
+    """
+    :param impl: one of IMPLEMENTATIONS
+    :param n: number of values
+    :return: a new DLL, deque or list holding range(n)
+    """
+    if impl == "DLL":
+        dll = DLL()
+        dll.list_to_dll(range(n))
+        return dll
+    return deque(range(n)) if impl == "deque" else list(range(n))
+
+
+def _remove_all(seq, val) -> int:
+    """
+    Baseline for DLL.remove_all on a deque or list: one filtering pass, then an in-place refill
+    :param seq: deque or list
+    :param val: value to drop
+    :return: number of values removed
+    """
+    kept = [item for item in seq if item != val]
+    removed = len(seq) - len(kept)
+    seq.clear()
+    seq.extend(kept)
+    return removed
+
+
+_shared = {}
+
+
+def _fresh(impl: str, n: int) -> tuple:
+    """
+    :param impl: one of IMPLEMENTATIONS
+    :param n: list size
+    :return: arguments for a run that mutates its list: a newly built one
+    """
+    return _build(impl, n), n
+
+
+def _reused(impl: str, n: int) -> tuple:
+    """
+    :param impl: one of IMPLEMENTATIONS
+    :param n: list size
+    :return: arguments for a read-only run: a list and an equal twin, built once per implementation and size
+    """
+    if (impl, n) not in _shared:
+        _shared.clear()
+        _shared[impl, n] = (_build(impl, n), _build(impl, n))
+    return _shared[impl, n] + (n,)
+
+
+def _sized(impl: str, n: int) -> tuple:
+    """
+    :param impl: one of IMPLEMENTATIONS
+    :param n: list size
+    :return: arguments for a run that builds its own list
+    """
+    return n,
+
+
+# op: (prepare(impl, n) -> run arguments, {implementation: run}); values are range(n), so every
+# search below walks the whole list
+SCALING_OPS = {
+    "push": (_fresh, {"DLL": lambda dll, n: _consume(map(dll.push, range(BATCH))),
+                      "deque": lambda seq, n: _consume(map(seq.append, range(BATCH))),
+                      "list": lambda seq, n: _consume(map(seq.append, range(BATCH)))}),
+    "pop": (_fresh, {"DLL": lambda dll, n: _consume(starmap(dll.pop, repeat((), min(BATCH, n)))),
+                     "deque": lambda seq, n: _consume(starmap(seq.pop, repeat((), min(BATCH, n)))),
+                     "list": lambda seq, n: _consume(starmap(seq.pop, repeat((), min(BATCH, n))))}),
+    "list_to_dll": (_sized, {"DLL": lambda n: DLL().list_to_dll(range(n)),
+                             "deque": lambda n: deque(range(n)),
+                             "list": lambda n: list(range(n))}),
+    "dll_to_list": (_reused, {"DLL": lambda dll, twin, n: dll.dll_to_list(),
+                              "deque": lambda seq, twin, n: list(seq),
+                              "list": lambda seq, twin, n: list(seq)}),
+    "find": (_reused, {"DLL": lambda dll, twin, n: dll.find(n - 1),
+                       "deque": lambda seq, twin, n: seq.index(n - 1),
+                       "list": lambda seq, twin, n: seq.index(n - 1)}),
+    "find_all": (_reused, {"DLL": lambda dll, twin, n: dll.find_all(n // 2),
+                           "deque": lambda seq, twin, n: [item for item in seq if item == n // 2],
+                           "list": lambda seq, twin, n: [item for item in seq if item == n // 2]}),
+    "remove": (_fresh, {"DLL": lambda dll, n: dll.remove(n - 1),
+                        "deque": lambda seq, n: seq.remove(n - 1),
+                        "list": lambda seq, n: seq.remove(n - 1)}),
+    "remove_all": (_fresh, {"DLL": lambda dll, n: dll.remove_all(n // 2),
+                            "deque": lambda seq, n: _remove_all(seq, n // 2),
+                            "list": lambda seq, n: _remove_all(seq, n // 2)}),
+    "reverse": (_reused, {"DLL": lambda dll, twin, n: dll.reverse(),
+                          "deque": lambda seq, twin, n: seq.reverse(),
+                          "list": lambda seq, twin, n: seq.reverse()}),
+    "__eq__": (_reused, {"DLL": lambda dll, twin, n: dll == twin,
+                         "deque": lambda seq, twin, n: seq == twin,
+                         "list": lambda seq, twin, n: seq == twin}),
+    "fix_playlist": (_fresh, {"DLL": lambda dll, n: fix_playlist(dll)}),
+}
+
+
+def time_run(prepare: Callable, run: Callable, impl: str, n: int, repeat: int) -> float:
+    """
+    Times run on arguments from prepare, which is called untimed before every run; gc is paused while timing
+    :param prepare: callable(impl, n) returning the arguments of run
+    :param run: the operation being measured
+    :param impl: implementation name passed to prepare
+    :param n: list size passed to prepare
+    :param repeat: number of timed runs
+    :return: fastest wall-clock time of run, in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        args = prepare(impl, n)
+        gc.collect()
+        gc.disable()
+        try:
+            start = perf_counter()
+            run(*args)
+            best = min(best, perf_counter() - start)
+        finally:
+            gc.enable()
+        del args
+    return best
+
+
+def scaling(sizes: List[int], ops: List[str], repeat: int) -> List[Dict]:
+    """
+    Times every op on DLL and, where there is an equivalent, on deque and list, printing a table as it goes
+    :param sizes: list sizes to measure
+    :param ops: names from SCALING_OPS
+    :param repeat: timed runs per measurement; the fastest is kept
+    :returns: one record per measurement with op, impl, n, calls and seconds
+    """
+    records = []
+    print(f"{'n':>10} {'op':>12} " + " ".join(f"{impl + ' s':>11}" for impl in IMPLEMENTATIONS))
+    for n in sizes:
+        for op in ops:
+            prepare, runs = SCALING_OPS[op]
+            row = {}
+            for impl, run in runs.items():
+                row[impl] = time_run(prepare, run, impl, n, repeat)
+                records.append({"op": op, "impl": impl, "n": n, "seconds": row[impl],
+                                "calls": min(BATCH, n) if op in ("push", "pop") else 1})
+            print(f"{n:>10} {op:>12} " + " ".join(f"{row[impl]:>11.6f}" if impl in row else f"{'-':>11}"
+                                                  for impl in IMPLEMENTATIONS))
+        _shared.clear()
+    return records
+
+
+def regressions(records: List[Dict], baseline: Dict, threshold: float) -> List[str]:
+    """
+    Compares DLL timings against a results file written by an earlier run
+    :param records: measurements from this run
+    :param baseline: parsed results file of the earlier run
+    :param threshold: allowed slowdown as a fraction, e.g. 0.25 for 25%
+    :returns: one message per DLL measurement slower than baseline * (1 + threshold); runs under
+        NOISE_FLOOR in both are not compared
+    """
+    previous = {(record["op"], record["n"]): record["seconds"]
+                for record in baseline["results"] if record["impl"] == "DLL"}
+    failures = []
+    for record in records:
+        before = previous.get((record["op"], record["n"]))
+        if record["impl"] != "DLL" or before is None or max(before, record["seconds"]) < NOISE_FLOOR:
+            continue
+        if record["seconds"] > before * (1 + threshold):
+            failures.append(f"{record['op']} n={record['n']}: {record['seconds']:.6f}s vs {before:.6f}s "
+                            f"(+{record['seconds'] / before - 1:.0%})")
+    return failures
+
+
+def peak_memory(func: Callable) -> int:
+    """
+    :param func: zero-argument callable to measure
+    :return: peak bytes allocated while func runs, beyond what was allocated before it
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def sorting(sizes: List[int], repeat: int) -> None:
+    """
+    Prints time and peak memory of DLL.sort against exporting with dll_to_list, sorting and rebuilding with
+    list_to_dll, on shuffled ints
+    :param sizes: list sizes to measure
+    :param repeat: timed runs per measurement; the fastest is kept
+    :returns: None
+    """
+    def in_place(dll: DLL) -> None:
+        dll.sort()
+
+    def rebuild(dll: DLL) -> None:
+        dll.list_to_dll(sorted(dll.dll_to_list()))
+
+    print(f"{'n':>10} {'path':>10} {'seconds':>10} {'peak MiB':>9}")
+    for n in sizes:
+        values = list(range(n))
+        Random(331).shuffle(values)
+        for name, run in (("sort", in_place), ("rebuild", rebuild)):
+            def prepare(impl: str, size: int) -> tuple:
+                dll = DLL()
+                dll.list_to_dll(values)
+                return dll,
+            seconds = time_run(prepare, run, "DLL", n, repeat)
+            dll = prepare("DLL", n)[0]
+            peak = peak_memory(lambda: run(dll))
+            print(f"{n:>10} {name:>10} {seconds:>10.4f} {peak / 2 ** 20:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    mem = commands.add_parser("memory", help="bytes per value, DLL vs ArrayDLL")
+    mem.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    unroll = commands.add_parser("unrolled", help="traversal time and memory, DLL vs UnrolledDLL")
+    unroll.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    unroll.add_argument("--capacity", type=int, default=64)
+    scale = commands.add_parser("scaling", help="time every operation by size, DLL vs deque and list")
+    scale.add_argument("--sizes", type=int, nargs="+", default=[10 ** e for e in range(3, 8)])
+    scale.add_argument("--ops", nargs="+", choices=list(SCALING_OPS), default=list(SCALING_OPS))
+    scale.add_argument("--repeat", type=int, default=3)
+    scale.add_argument("--output", help="write the results as JSON to this file")
+    scale.add_argument("--baseline", help="JSON results of an earlier run; exit 1 if DLL got slower")
+    scale.add_argument("--threshold", type=float, default=0.25,
+                       help="allowed slowdown against --baseline, as a fraction (default 0.25)")
+    sort = commands.add_parser("sort", help="DLL.sort vs dll_to_list, sorted and list_to_dll")
+    sort.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    sort.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == "memory":
+        memory(args.sizes)
+    elif args.command == "unrolled":
+        unrolled(args.sizes, args.capacity)
+    elif args.command == "sort":
+        sorting(args.sizes, args.repeat)
+    elif args.command == "scaling":
+        records = scaling(args.sizes, args.ops, args.repeat)
+        if args.output:
+            meta = {"python": sys.version, "platform": platform.platform(), "batch": BATCH, "repeat": args.repeat}
+            with open(args.output, "w") as fp:
+                json.dump({"meta": meta, "results": records}, fp, indent=1)
+        if args.baseline:
+            with open(args.baseline) as fp:
+                failures = regressions(records, json.load(fp), args.threshold)
+            if failures:
+                parser.exit(1, "regressions:\n" + "\n".join(failures) + "\n")
+
+
+if __name__ == "__main__":
+    main()
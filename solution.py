@@ -1,4 +1,26 @@
-from typing import TypeVar, List
+import asyncio
+import copy
+import functools
+import inspect
+import mmap
+import multiprocessing
+import operator
+import pickle
+import struct
+from array import array
+from bisect import bisect_left
+from collections import deque
+from itertools import accumulate, chain, islice, zip_longest
+from multiprocessing import shared_memory
+from random import Random
+from threading import Condition, Lock
+from time import monotonic, perf_counter
+from typing import Callable, Iterable, Iterator, TypeVar, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # only NumericDLL needs numpy
+    np = None
 
 # for more information on type hinting, check out https://docs.python.org/3/library/typing.html
 T = TypeVar("T")  # represents generic type
@@ -46,336 +68,3928 @@ class Node:
     __str__ = __repr__
 
 
-class DLL:
+class NodePool:
     """
-    Implementation of a doubly linked list without padding nodes.
-    Modify only below indicated line.
+    Bounded stack of detached Nodes which DLLs draw from instead of allocating a new Node per push.
+    A pool may belong to one DLL or be shared by several.
     """
-    __slots__ = ["head", "tail", "size"]
+    __slots__ = ["maxsize", "hits", "misses", "_free"]
 
-    def __init__(self) -> None:
+    def __init__(self, maxsize: int = 1024) -> None:
         """
-        Construct an empty doubly linked list.
+        Construct an empty pool.
 
+        :param maxsize: maximum number of detached Nodes kept for reuse.
         :return: None.
         """
-        self.head = self.tail = None
-        self.size = 0
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self._free = []
 
-    def __repr__(self) -> str:
+    def __len__(self) -> int:
         """
-        Represent the DLL as a string.
-
-        :return: string representation of the DLL.
+        :return: number of Nodes currently available for reuse
         """
-        result = []
-        node = self.head
-        while node is not None:
-            result.append(str(node))
-            node = node.next
-            if node is self.head:
-                break
-        return " <-> ".join(result)
+        return len(self._free)
 
-    def __str__(self) -> str:
+    def acquire(self, value: T) -> Node:
         """
-        Represent the DLL as a string.
+        Takes a detached Node from the pool, or allocates one when the pool is empty
+        :param value: value the Node will hold
+        :return: a Node holding value with next and prev set to None
+        """
+        if self._free:
+            self.hits += 1
+            node = self._free.pop()
+            node.value = value
+            return node
+        self.misses += 1
+        return Node(value)
 
-        :return: string representation of the DLL.
+    def release(self, node: Node) -> None:
         """
-        return repr(self)
+        Detaches a Node that left its list and keeps it for reuse while the pool has room
+        :param node: the unlinked Node; the caller must not use it afterwards
+        :returns: None
+        """
+        node.value = node.next = node.prev = None
+        if len(self._free) < self.maxsize:
+            self._free.append(node)
 
-    def __eq__(self, other: DLL) -> bool:
+    def stats(self) -> dict:
         """
-        :param other: compares equality with this List
-        :return: True if equal otherwise False
+        :return: dict with the hit and miss counts and the number of pooled Nodes
         """
-        cur_node = self.head
-        other_node = other.head
-        while True:
-            if cur_node != other_node:
-                return False
-            if cur_node is None and other_node is None:
-                return True
-            if cur_node is None or other_node is None:
-                return False
-            cur_node = cur_node.next
-            other_node = other_node.next
-            if cur_node is self.head and other_node is other.head:
+        return {"hits": self.hits, "misses": self.misses, "pooled": len(self._free)}
+
+
+def _value_matcher(values: Iterable[T]) -> Tuple[set, Callable[[T], bool]]:
+    """
+    Builds a membership test for values, hashing where possible and comparing unhashable values one by one
+    :param values: the values to match against
+    :returns: tuple of the set of hashable values and a predicate telling whether a value is among values
+    """
+    hashable, unhashable = set(), []
+    for val in values:
+        try:
+            hashable.add(val)
+        except TypeError:
+            unhashable.append(val)
+
+    def matches(value: T) -> bool:
+        try:
+            if value in hashable:
                 return True
-            if cur_node is self.head or other_node is other.head:
-                return False
+        except TypeError:
+            pass
+        return any(value == val for val in unhashable)
 
-    # MODIFY BELOW #
-    # Refer to the classes provided to understand the problems better#
+    return hashable, matches
 
-    def empty(self) -> bool:
+
+class _SkipEntry:
+    """
+    Tower of the skip layer above one Node; width[l] counts Nodes from this entry to next[l].
+    """
+    __slots__ = ["node", "next", "prev", "width"]
+
+    def __init__(self, node: Node, height: int) -> None:
         """
-        Checks the head of the DLL to see if it contains any Nodes
-        :return: A Ture boolean if empty, False otherwise
+        Construct an unlinked tower.
+
+        :param node: the DLL Node this tower stands on (None for the layer header).
+        :param height: number of levels in the tower.
+        :return: None.
         """
-        if self.head is not None:
-            return False
-        else:
-            return True
+        self.node = node
+        self.next = [None] * height
+        self.prev = [None] * height
+        self.width = [0] * height
 
-    def push(self, val: T, back: bool = True) -> None:
+
+class _SkipLayer:
+    """
+    Indexable skip list over the Nodes of a DLL, giving O(log n) expected positional access.
+    Positions are 0-based; the header sits before position 0. Tower heights come from the layer's own
+    Random, leaving the global random stream untouched.
+    """
+    __slots__ = ["_header", "_entries", "_top", "_random"]
+
+    MAX_LEVEL = 32
+
+    def __init__(self) -> None:
         """
-        Adds a new node to the back or front of an existing DLL
-        :param val: val of the new node to be added
-        :param back: boolean indicating adding new node to front (False) or back (True)
-        :returns: None
+        Construct an empty skip layer.
+
+        :return: None.
         """
-        new_node = Node(val)
-        if not self.empty():
-            if back == True:
-                if self.size == 1:
-                    self.head.next = new_node
-                new_node.prev = self.tail
-                self.tail.next = new_node
-                self.tail = new_node
-                self.size += 1
-            else:
-                self.head.prev = new_node
-                new_node.next = self.head
-                self.head = new_node
-                self.size += 1
-        else:
-            self.head = new_node
-            self.tail = new_node
-            self.size = 1
+        self._header = _SkipEntry(None, self.MAX_LEVEL)
+        self._entries = {}
+        self._top = 1
+        self._random = Random()
 
-    def pop(self, back: bool = True) -> None:
+    def __contains__(self, node: Node) -> bool:
         """
-        Removes the first or last Node from a DLL dependent on param: back
-        :param back: boolean indicating removal from front (False) or back (True)
-        :returns: None
+        :param node: Node to look up
+        :return: True if node is tracked by the layer
         """
-        if not self.empty():
-            if back == True:  # remove at back
-                self.tail = self.tail.prev
-                if self.tail is not None:
-                    self.tail.next = None
-                self.size -= 1
+        return id(node) in self._entries
 
-                if self.size == 0:
-                    self.head = None
-                    self.tail = None
+    def _height(self) -> int:
+        """
+        :return: random tower height, geometric with p = 1/2
+        """
+        height = 1
+        while height < self.MAX_LEVEL and self._random.random() < 0.5:
+            height += 1
+        if height > self._top:
+            self._top = height
+        return height
 
-            else:  # remove at front
-                if self.head == self.tail:
-                    self.tail = None
-                self.head = self.head.next
-                if self.head is not None:
-                    self.head.prev = None
-                self.size -= 1
-        else:
-            return
+    def _predecessors(self, i: int) -> Tuple[list, list]:
+        """
+        Finds, at each level, the last tower strictly before position i and its position
+        :param i: 0-based position
+        :returns: tuple of the predecessor towers and their 1-based positions (header is 0)
+        """
+        update, positions = [None] * self._top, [0] * self._top
+        entry, pos = self._header, 0
+        for level in range(self._top - 1, -1, -1):
+            while entry.next[level] is not None and pos + entry.width[level] <= i:
+                pos += entry.width[level]
+                entry = entry.next[level]
+            update[level], positions[level] = entry, pos
+        return update, positions
 
-    def list_to_dll(self, source: List[T]) -> None:
+    def get(self, i: int) -> Node:
         """
-        Takes a python list and creates a DLL from its contents
-        :param source: python list to be appended to
-        :returns: python list containing DLL values
+        :param i: 0-based position, assumed in range
+        :return: the Node at position i
         """
-        self.size = 0
-        for i in source:
-            self.push(i)
+        entry, remaining = self._header, i + 1
+        for level in range(self._top - 1, -1, -1):
+            while entry.next[level] is not None and entry.width[level] <= remaining:
+                remaining -= entry.width[level]
+                entry = entry.next[level]
+        return entry.node
 
-    def dll_to_list(self) -> List[T]:
+    def insert(self, i: int, node: Node) -> None:
         """
-        Takes a DLL and creates a Python list from its contents
-        :returns: DLL  containing Python list values
+        Tracks node as the new occupant of position i, shifting later positions up by one
+        :param i: 0-based position, 0 <= i <= number of tracked Nodes
+        :param node: Node being linked into the DLL at position i
+        :returns: None
         """
-        ptr = self.head
-        new_list = []
-        if ptr is not None:
-            while ptr is not None:
-                new_list.append(ptr.value)
-                ptr = ptr.next
-            return new_list
-        else:
-            return new_list
+        height = self._height()
+        update, positions = self._predecessors(i)
+        entry = self._entries[id(node)] = _SkipEntry(node, height)
+        for level in range(self._top):
+            before = update[level]
+            if level < height:
+                after = before.next[level]
+                entry.next[level], entry.prev[level] = after, before
+                if after is not None:
+                    after.prev[level] = entry
+                    entry.width[level] = positions[level] + before.width[level] - i
+                before.next[level] = entry
+                before.width[level] = i + 1 - positions[level]
+            elif before.next[level] is not None:
+                before.width[level] += 1
 
-    def _find_nodes(self, val: T, find_first: bool = False) -> List[Node]:
+    def delete(self, i: int) -> Node:
         """
-        Finds nodes from a DLL with the same value of param val; will find all nodes dependent on find-first
-        :param val: the value to be found
-        :param find_first: boolean indicating to find 1 Node (True) or all Nodes (False)
-        :returns: a list of all the nodes, 1 Node or None (value not found)
+        Stops tracking the Node at position i, shifting later positions down by one
+        :param i: 0-based position, assumed in range
+        :return: the Node that was at position i
         """
-        ptr = self.head
-        new_list = []
-        if ptr is not None:
-            while ptr is not None:
-                if ptr.value == val:
-                    new_list.append(ptr)
-                    if find_first == True:
-                        return new_list
-                ptr = ptr.next
+        update, _ = self._predecessors(i)
+        entry = update[0].next[0]
+        height = len(entry.next)
+        for level in range(self._top):
+            before = update[level]
+            if level < height:
+                after = entry.next[level]
+                before.next[level] = after
+                if after is not None:
+                    after.prev[level] = before
+                    before.width[level] += entry.width[level] - 1
+            elif before.next[level] is not None:
+                before.width[level] -= 1
+        del self._entries[id(entry.node)]
+        return entry.node
 
-            if len(new_list) != 0:
-                return new_list
+    def rank(self, node: Node) -> int:
+        """
+        Computes the position of a tracked Node by climbing towers back to the header
+        :param node: a Node tracked by the layer
+        :return: 0-based position of node
+        """
+        entry, pos = self._entries[id(node)], 0
+        while entry is not self._header:
+            level = len(entry.next) - 1
+            entry = entry.prev[level]
+            pos += entry.width[level]
+        return pos - 1
 
-        else:
-            return None
+    def discard(self, node: Node) -> None:
+        """
+        Stops tracking node
+        :param node: a Node tracked by the layer
+        :returns: None
+        """
+        self.delete(self.rank(node))
 
-    def find(self, val: T) -> Node:
+    def rebuild(self, nodes: Iterable[Node]) -> None:
         """
-        Calls _find_nodes to find the first occurrence of a Node with value val
-        :param val: the node value to be found
-        :returns: The node found or None
+        Replaces the tracked Nodes with nodes, in order, in O(n)
+        :param nodes: Nodes in list order
+        :returns: None
         """
-        value = self._find_nodes(val, True)
-        if value is not None:
-            return value[0]
-        else:
-            return None
+        self.__init__()
+        header = self._header
+        last, last_pos = [header] * self.MAX_LEVEL, [0] * self.MAX_LEVEL
+        pos = 0
+        for node in nodes:
+            pos += 1
+            height = self._height()
+            entry = self._entries[id(node)] = _SkipEntry(node, height)
+            for level in range(height):
+                before = last[level]
+                before.next[level] = entry
+                before.width[level] = pos - last_pos[level]
+                entry.prev[level] = before
+                last[level], last_pos[level] = entry, pos
 
-    def find_all(self, val: T) -> List[Node]:
+
+class _OutOfBand:
+    """
+    Pickles a bytes-like value through a PickleBuffer so protocol 5 can ship it out-of-band.
+    """
+    __slots__ = ["value"]
+
+    def __init__(self, value: bytes) -> None:
         """
-        Finds all node instances within a DLL
-        :param val: node value to be searched for
-        :return: a python list containing the node objects or an empty list if not found
+        Wrap a bytes-like value.
+
+        :param value: bytes or bytearray value of a DLL.
+        :return: None.
         """
-        value = self._find_nodes(val)
-        if value is not None:
-            return value
-        else:
-            return []
+        self.value = value
 
-    def _remove_node(self, to_remove: Node) -> None:
+    def __reduce_ex__(self, protocol: int) -> tuple:
         """
-        Removes the node passed as a param
-        :param to_remove: a reference to the node to be removed
-        :returns: None
+        :param protocol: pickle protocol in use (always >= 5 here)
+        :return: reduce tuple rebuilding the value from its buffer
         """
+        return _from_buffer, (pickle.PickleBuffer(self.value), type(self.value))
 
-        if self.head == to_remove:  # remove from front
-            if self.head is self.tail:
-                self.tail = None
-            self.head = self.head.next
-            if self.head is not None:
-                self.head.prev = None
 
-        elif self.tail == to_remove:  # remove from end
-            self.tail = self.tail.prev
-            self.tail.next = None
+def _from_buffer(buffer, kind: type) -> bytes:
+    """
+    Rebuilds a bytes-like value, reusing the original object when the buffer still refers to it
+    :param buffer: the in-band value or the out-of-band buffer handed to pickle.loads
+    :param kind: bytes or bytearray, the type of the pickled value
+    :returns: the value as kind
+    """
+    with memoryview(buffer) as view:
+        if type(view.obj) is kind:
+            return view.obj
+        return kind(view)
 
-        elif self.size == 1 and self.head == to_remove:  # remove last el
-            self.head = None
-            self.tail = None
 
-        else:
-            to_remove.next.prev = to_remove.prev
-            to_remove.prev.next = to_remove.next
+# playlist shapes reported by diagnose_playlist and tracked by DLL(track_shape=True)
+LINEAR = "linear"  # forward links end at the tail (a "broken" playlist)
+CIRCULAR = "circular"  # tail links back to head (a "proper" playlist)
+IMPROPER = "improper"  # forward links loop back to a node other than head
+SUSPECT = "suspect"  # possibly corrupted: not known since the last change, or links disagree with size
 
-    def remove(self, val: T) -> bool:
+
+REPR_ITEMS = 10  # nodes shown at each end by the repr of a longer list
+
+
+def _bounded_repr(forward: Iterator[str], backward: Iterator[str], size: int, k: int = REPR_ITEMS) -> str:
+    """
+    Joins formatted nodes with " <-> ", showing only the first and last k of a longer list, so the repr of a huge
+    list costs O(k)
+    :param forward: formatted nodes from head to tail
+    :param backward: formatted nodes from tail to head
+    :param size: number of nodes, reported for a truncated list
+    :param k: number of nodes shown at each end
+    :returns: the full join for at most 2k nodes, else "<first k> <-> ... <-> <last k> (size=<size>)"
+    """
+    first = list(islice(forward, 2 * k + 1))
+    if len(first) <= 2 * k:
+        return " <-> ".join(first)
+    last = list(islice(backward, k))[::-1]
+    return f"{' <-> '.join(first[:k])} <-> ... <-> {' <-> '.join(last)} (size={size})"
+
+
+_EDGE = object()  # stands for the ends of the list in fingerprint pairs
+_FINGERPRINT_MASK = (1 << 64) - 1
+
+
+def _pair_hash(before: T, after: T) -> int:
+    """
+    Hashes an adjacent pair of values for the fingerprint. The tuple hash is put through the splitmix64 finalizer:
+    raw tuple hashes are too regular to be summed, e.g. [1, 2, 3] and [3, 2, 1] would often collide
+    :param before: the earlier value of the pair
+    :param after: the later value of the pair
+    :returns: 64-bit hash of the pair
+    """
+    x = hash((before, after)) & _FINGERPRINT_MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _FINGERPRINT_MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _FINGERPRINT_MASK
+    return x ^ (x >> 31)
+
+
+_EMPTY_FINGERPRINT = _pair_hash(_EDGE, _EDGE)  # the pair of ends an empty list consists of
+
+
+def _fingerprint_run(values: Iterable[T], before: T = _EDGE, after: T = _EDGE) -> Tuple[int, int]:
+    """
+    Fingerprint contribution of a run of values linked between two neighbours. A DLL's fingerprint sums a hash of
+    every adjacent pair of values, ends included, so linking or unlinking a run changes it by this amount
+    whatever the run's position
+    :param values: the run, in order
+    :param before: value linked before the run, or _EDGE at the head
+    :param after: value linked after the run, or _EDGE at the tail
+    :returns: forward and backward contributions; the backward one hashes each pair the other way round
+    """
+    forward = -_pair_hash(before, after)
+    backward = -_pair_hash(after, before)
+    for val in values:
+        forward += _pair_hash(before, val)
+        backward += _pair_hash(val, before)
+        before = val
+    forward += _pair_hash(before, after)
+    backward += _pair_hash(after, before)
+    return forward, backward
+
+
+def _make_dll(cls: type, options: dict) -> "DLL":
+    """
+    Constructs an empty DLL (or subclass) for unpickling
+    :param cls: the class to construct
+    :param options: constructor keyword arguments
+    :returns: the empty list
+    """
+    return cls(**options)
+
+
+LATENCY_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0)  # seconds
+
+
+class _CountingLink:
+    """
+    Stand-in for the Node.next/Node.prev slot descriptor while instrumentation is enabled: reads go through
+    the original slot and are counted as node visits.
+    """
+    __slots__ = ["slot", "owner"]
+
+    def __init__(self, slot, owner: "Instrumentation") -> None:
         """
-        Removes the first instance of a node with value val
-        :param val: the value to be removed from the DLL
-        :return: A boolean; True if successful, False otherwise
+        :param slot: the original slot descriptor.
+        :param owner: the Instrumentation counting the reads.
+        :return: None.
         """
-        value = self.find(val)
-        if value is not None:
-            self._remove_node(value)
-            return True
-        else:
-            return False
+        self.slot = slot
+        self.owner = owner
 
-    def remove_all(self, val: T) -> int:
+    def __get__(self, node: Node, cls: type = None):
         """
-        Removes all node instances with the value passed to the functions
-        :param val: the value to be removed from the DLL
-        :return: An int representing the number of Nodes removed
+        :return: the linked Node, counting the read; this descriptor itself when looked up on the class
         """
-        value = self.find_all(val)
-        size = len(value)
-        for i, node in enumerate(value):
-            self._remove_node(value[i])
-        if size == 0:
-            return 0
-        else:
-            return size
+        if node is None:
+            return self
+        owner = self.owner
+        op = owner._stack[-1] if owner._stack else "other"
+        owner.visits[op] = owner.visits.get(op, 0) + 1
+        return self.slot.__get__(node, cls)
 
-    def reverse(self) -> None:
+    def __set__(self, node: Node, value: Node) -> None:
         """
-        Reorders a DLL in the reverse order
+        Links value without counting a visit
         :returns: None
         """
-        if not self.empty():
-            temp = None
-            ptr = self.head
-            while ptr is not None:
-                next = ptr.prev
-                prev = ptr.next
-                ptr.next = next
-                ptr.prev = prev
-                ptr = prev
+        self.slot.__set__(node, value)
 
-            temp = self.head
-            self.head = self.tail
-            self.tail = temp
 
-
-def fix_playlist(lst: DLL) -> bool:
+class Instrumentation:
     """
-    Checks a playlist modelded by a DLL to see if it is broken, has an improper loop, or is fixed; will fix a broken
-    list, but not an improper one.
-    :param lst: The DLL list to be checked
-    :return: A boolean True if the playlist is functional, or it was fixed by the program, returns False if it is
-    improper
+    Opt-in node-visit counters and latency histograms for DLL methods and fix_playlist.
+    Disabled, DLL and Node are untouched and nothing is measured. enable() swaps timing wrappers onto the DLL
+    methods and counting descriptors onto Node.next/prev; disable() puts the originals back.
+    Latency is recorded per call of each method, including calls made by other methods; a node visit (one read
+    of Node.next or Node.prev) is charged to the innermost operation running, or to "other" outside of any.
+    Counters are not synchronized; attribution assumes one thread uses DLLs at a time.
     """
+    WRAPPED = ("__eq__", "__getitem__", "__delitem__", "_find_nodes", "_remove_node")  # besides public methods
 
-    def connect_list(slow, fast) -> bool:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
         """
-        Contains the while loop creating Floyd's Cycle Finding Algorithm, will fix a broken loop
-        :param slow: a pointer to a node incremented by 1 every loop
-        :param fast: a pointer to a node incremented by 2 every loop
-        :return: A boolean, True if proper, False if improper
+        Construct disabled, empty instrumentation.
+
+        :param buckets: ascending upper bounds, in seconds, of the latency histogram buckets.
+        :return: None.
         """
+        self.buckets = tuple(buckets)
+        self.enabled = False
+        self.visits = {}
+        self.latency = {}
+        self._stack = []
+        self._originals = {}
 
-        proper = False
-        while fast is not None and fast.next is not None:
-            fast = fast.next.next
-            slow = slow.next
-            if fast is None:
-                fix_playlist_helper()
-                return True
-            if fast is lst.head or fast.next is lst.head:
+    def enable(self) -> None:
+        """
+        Starts measuring; a no-op when already enabled
+        :returns: None
+        """
+        if self.enabled:
+            return
+        for name, func in vars(DLL).items():
+            if callable(func) and (not name.startswith("_") or name in self.WRAPPED) \
+                    and not inspect.isgeneratorfunction(func):
+                self._originals[DLL, name] = func
+                setattr(DLL, name, self._wrap(name, func))
+        for name in ("next", "prev"):
+            slot = vars(Node)[name]
+            self._originals[Node, name] = slot
+            setattr(Node, name, _CountingLink(slot, self))
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Stops measuring and restores the original DLL methods and Node links; recorded data is kept
+        :returns: None
+        """
+        for (cls, name), original in self._originals.items():
+            setattr(cls, name, original)
+        self._originals.clear()
+        self._stack.clear()
+        self.enabled = False
+
+    def reset(self) -> None:
+        """
+        Discards everything recorded so far
+        :returns: None
+        """
+        self.visits.clear()
+        self.latency.clear()
+
+    def _wrap(self, name: str, func: Callable) -> Callable:
+        """
+        :param name: operation name to record under
+        :param func: the original method
+        :return: a method running func through call
+        """
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            return self.call(name, func, *args, **kwargs)
+        return timed
+
+    def call(self, name: str, func: Callable, *args, **kwargs):
+        """
+        Runs func, recording its latency under name and charging the node visits it makes directly to name.
+        A call of name from within name (e.g. a lazily reversed DLL re-entering push) is recorded once
+        :param name: operation name
+        :param func: callable to run
+        :returns: whatever func returns
+        """
+        stack = self._stack
+        if stack and stack[-1] == name:
+            return func(*args, **kwargs)
+        stack.append(name)
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.observe(name, perf_counter() - start)
+            stack.pop()
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        Adds one call of name taking seconds to its latency histogram
+        :param name: operation name
+        :param seconds: duration of the call
+        :returns: None
+        """
+        histogram = self.latency.get(name)
+        if histogram is None:
+            histogram = self.latency[name] = [0] * (len(self.buckets) + 1) + [0.0]
+        histogram[bisect_left(self.buckets, seconds)] += 1
+        histogram[-1] += seconds
+
+    def snapshot(self) -> dict:
+        """
+        :return: dict mapping each operation to its "calls", total "seconds", "node_visits" and "buckets",
+            a dict of cumulative call counts keyed by bucket upper bound (the last being float("inf"))
+        """
+        result = {}
+        for name in sorted(set(self.latency) | set(self.visits)):
+            histogram = self.latency.get(name, [0] * (len(self.buckets) + 1) + [0.0])
+            counts = list(accumulate(histogram[:-1]))
+            result[name] = {"calls": counts[-1], "seconds": histogram[-1], "node_visits": self.visits.get(name, 0),
+                            "buckets": dict(zip(self.buckets + (float("inf"),), counts))}
+        return result
+
+    def prometheus(self, prefix: str = "dll") -> str:
+        """
+        Renders the snapshot in the Prometheus text exposition format
+        :param prefix: metric name prefix
+        :return: a <prefix>_operation_seconds histogram and a <prefix>_node_visits_total counter, labelled by op
+        """
+        snapshot = self.snapshot()
+        lines = [f"# HELP {prefix}_operation_seconds Latency of DLL operations.",
+                 f"# TYPE {prefix}_operation_seconds histogram"]
+        for name, stats in snapshot.items():
+            if not stats["calls"]:
+                continue
+            for bound, count in stats["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{prefix}_operation_seconds_bucket{{op="{name}",le="{le}"}} {count}')
+            lines.append(f'{prefix}_operation_seconds_sum{{op="{name}"}} {stats["seconds"]!r}')
+            lines.append(f'{prefix}_operation_seconds_count{{op="{name}"}} {stats["calls"]}')
+        lines += [f"# HELP {prefix}_node_visits_total Node.next/prev reads, by innermost operation.",
+                  f"# TYPE {prefix}_node_visits_total counter"]
+        lines += [f'{prefix}_node_visits_total{{op="{name}"}} {stats["node_visits"]}'
+                  for name, stats in snapshot.items()]
+        return "\n".join(lines) + "\n"
+
+
+instrumentation = Instrumentation()  # the module's instrumentation; disabled until enable() is called
+
+
+class DLL:
+    """
+    Implementation of a doubly linked list without padding nodes.
+    Modify only below indicated line.
+    """
+    __slots__ = ["head", "tail", "_size", "_index", "_pool", "_skip", "_shape", "_flipped", "_fingerprint"]
+
+    def __init__(self, indexed: bool = False, pool: NodePool = None, indexable: bool = False,
+                 track_shape: bool = False, lazy_reverse: bool = False, fingerprint: bool = False) -> None:
+        """
+        Construct an empty doubly linked list.
+
+        :param indexed: if True, maintain a value -> nodes index so lookups and removals by value
+            cost O(k) for k matches instead of a full scan. Values must be hashable.
+        :param pool: NodePool that push draws Nodes from and pop/removals return them to. Nodes
+            handed back to the pool are reused, so callers must drop references to removed Nodes.
+        :param indexable: if True, maintain a skip layer over the Nodes so positional access,
+            insert, deletion and index() cost O(log n) instead of a walk.
+        :param track_shape: if True, remember whether the playlist is linear, circular or improper as
+            DLL methods change it, so repeat fix_playlist calls are O(1). Code that rewires Node links
+            directly must call invalidate_shape afterwards.
+        :param lazy_reverse: if True, reverse() is O(1): it swaps head and tail and flips an orientation
+            flag instead of every Node's links. While flipped, a Node's logical successor is its prev;
+            DLL methods account for this, and materialize() rewires the Nodes for code that reads
+            Node.next/prev directly.
+        :param fingerprint: if True, maintain an order-sensitive fingerprint of the values in O(1) per change, so
+            comparing lists that differ usually costs O(1) instead of a walk. Values must be hashable.
+        :return: None.
+        """
+        self.head = self.tail = None
+        self.size = 0
+        self._index = {} if indexed else None
+        self._pool = pool
+        self._skip = _SkipLayer() if indexable else None
+        self._shape = LINEAR if track_shape else None
+        self._flipped = False if lazy_reverse else None
+        self._fingerprint = [_EMPTY_FINGERPRINT] * 2 if fingerprint else None
+
+    @property
+    def size(self) -> int:
+        """
+        Number of Nodes in the DLL; counted on first use after a concat, split_after or splice whose count was not
+        supplied
+        """
+        if self._size is None:
+            count = 0
+            for _ in self.iter_nodes():
+                count += 1
+            self._size = count
+        return self._size
+
+    @size.setter
+    def size(self, value: int) -> None:
+        self._size = value
+
+    def __repr__(self) -> str:
+        """
+        Represent the DLL as a string.
+
+        :return: string representation of the DLL; only the first and last REPR_ITEMS nodes of a longer one.
+        """
+        return _bounded_repr(map(str, self.iter_nodes()), map(str, self.iter_nodes(reverse=True)), self.size)
+
+    def __str__(self) -> str:
+        """
+        Represent the DLL as a string.
+
+        :return: string representation of the DLL.
+        """
+        return repr(self)
+
+    def __eq__(self, other: DLL) -> bool:
+        """
+        :param other: compares equality with this List
+        :return: True if equal otherwise False
+        """
+        if self is other:
+            return True
+        if self.size != other.size:
+            return False
+        if self._fingerprint is not None and other._fingerprint is not None \
+                and self._fingerprint[0] != other._fingerprint[0]:
+            return False
+        if self._flipped or other._flipped:
+            ours, theirs = self.iter_nodes(), other.iter_nodes()
+            return all(a is not None and b is not None and a == b for a, b in zip_longest(ours, theirs))
+        cur_node = self.head
+        other_node = other.head
+        while True:
+            if cur_node != other_node:
+                return False
+            if cur_node is None and other_node is None:
                 return True
-            if fast is slow:
+            if cur_node is None or other_node is None:
+                return False
+            cur_node = cur_node.next
+            other_node = other_node.next
+            if cur_node is self.head and other_node is other.head:
+                return True
+            if cur_node is self.head or other_node is other.head:
                 return False
-        lst.head.prev = lst.tail
-        lst.tail.prev = lst.head
-        return True
 
-    def fix_playlist_helper():
+    def __iter__(self) -> Iterator[T]:
         """
-        Sets the head and tail next/prev to the correct nodes; also handles DLL of size 1
+        Lazily yields the values from head to tail; a circular playlist is walked once.
+
+        :return: iterator over the DLL values.
+        """
+        node = self.head
+        if self._flipped:
+            while node is not None:
+                yield node.value
+                node = node.prev
+                if node is self.head:
+                    break
+            return
+        while node is not None:
+            yield node.value
+            node = node.next
+            if node is self.head:
+                break
+
+    def _options(self) -> dict:
+        """
+        :return: constructor keyword arguments reproducing this DLL's optional features, without its pool
+        """
+        return {"indexed": self._index is not None, "indexable": self._skip is not None,
+                "track_shape": self._shape is not None, "lazy_reverse": self._flipped is not None,
+                "fingerprint": self._fingerprint is not None}
+
+    def _circular(self) -> bool:
+        """
+        :return: True if the DLL is a playlist closed into a proper loop, else False
+        """
+        if self.tail is None:
+            return False
+        return (self.tail.prev if self._flipped else self.tail.next) is self.head
+
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        """
+        Pickles the DLL as one flat sequence of values instead of a recursive chain of Nodes.
+        With protocol 5, bytes and bytearray values are offered as out-of-band buffers.
+
+        :param protocol: pickle protocol in use.
+        :return: reduce tuple; the state is the list of values and whether the playlist is circular.
+        """
+        values = list(self)
+        if protocol >= 5:
+            values = [_OutOfBand(val) if type(val) in (bytes, bytearray) else val for val in values]
+        return _make_dll, (type(self), self._options()), (values, self._circular())
+
+    def __setstate__(self, state: tuple) -> None:
+        """
+        Relinks the DLL from pickled state.
+
+        :param state: list of values and whether the playlist is circular.
+        :return: None.
+        """
+        values, circular = state
+        self.list_to_dll(values)
+        if circular:
+            self._close()
+
+    def __copy__(self) -> DLL:
+        """
+        Copies the DLL into new Nodes holding the same value objects, sharing the Node pool.
+
+        :return: the shallow copy.
+        """
+        result = type(self)(pool=self._pool, **self._options())
+        result.__setstate__((self, self._circular()))
+        return result
+
+    def __deepcopy__(self, memo: dict) -> DLL:
+        """
+        Copies the DLL and deep-copies each value in one iterative pass, sharing the Node pool.
+
+        :param memo: deepcopy memo dictionary.
+        :return: the deep copy.
+        """
+        result = type(self)(pool=self._pool, **self._options())
+        memo[id(self)] = result
+        result.__setstate__(((copy.deepcopy(val, memo) for val in self), self._circular()))
+        return result
+
+    def __reversed__(self) -> Iterator[T]:
+        """
+        Lazily yields the values from tail to head; a circular playlist is walked once.
+
+        :return: iterator over the DLL values in reverse order.
+        """
+        node = self.tail
+        if self._flipped:
+            while node is not None:
+                yield node.value
+                node = node.next
+                if node is self.tail:
+                    break
+            return
+        while node is not None:
+            yield node.value
+            node = node.prev
+            if node is self.tail:
+                break
+
+    # MODIFY BELOW #
+    # Refer to the classes provided to understand the problems better#
+
+    def empty(self) -> bool:
+        """
+        Checks the head of the DLL to see if it contains any Nodes
+        :return: A Ture boolean if empty, False otherwise
+        """
+        if self.head is not None:
+            return False
+        else:
+            return True
+
+    def _index_add(self, node: Node, back: bool = True) -> None:
+        """
+        Records node in the value index at the back (or front) of its value's bucket
+        :param node: the node being linked into the DLL
+        :param back: boolean indicating node is linked after (True) or before (False) all equal values
         :returns: None
         """
-        if lst.size == 1:
-            lst.head.next = lst.head
-            lst.head.prev = lst.head
+        bucket = self._index.get(node.value)
+        if bucket is None:
+            bucket = self._index[node.value] = deque()
+        if back:
+            bucket.append(node)
         else:
-            lst.head.prev = lst.tail
-            lst.tail.next = lst.head
+            bucket.appendleft(node)
+
+    def _index_discard(self, node: Node) -> None:
+        """
+        Drops node from the value index; O(1) when node is the first or last of its value
+        :param node: the node being unlinked from the DLL
+        :returns: None
+        """
+        bucket = self._index[node.value]
+        if bucket[0] is node:
+            bucket.popleft()
+        elif bucket[-1] is node:
+            bucket.pop()
+        else:
+            for i, other in enumerate(bucket):
+                if other is node:
+                    del bucket[i]
+                    break
+        if not bucket:
+            del self._index[node.value]
+
+    def _index_insert(self, node: Node) -> None:
+        """
+        Records a node linked between two others in the value index, keeping its bucket in list order
+        :param node: the node just linked into the DLL
+        :returns: None
+        """
+        bucket = self._index.get(node.value)
+        if bucket is None:
+            self._index[node.value] = deque([node])
+        elif self._skip is not None:  # binary search the bucket by position
+            pos = self._skip.rank(node)
+            lo, hi = 0, len(bucket)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._skip.rank(bucket[mid]) < pos:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            bucket.insert(lo, node)
+        else:  # insert before the next node of equal value
+            after = node.next
+            while after is not None and after.value != node.value:
+                after = after.next
+            for i, other in enumerate(bucket):
+                if other is after:
+                    bucket.insert(i, node)
+                    return
+            bucket.append(node)
+
+    def _reshaped(self) -> None:
+        """
+        Notes a change made through DLL methods for shape tracking: they keep a linear DLL linear,
+        but a circular or improper one has to be checked again
+        :returns: None
+        """
+        if self._shape is not LINEAR:
+            self._shape = SUSPECT
+
+    def invalidate_shape(self) -> None:
+        """
+        Forgets the tracked shape after Node links were rewired directly, so the next fix_playlist runs
+        the full check
+        :returns: None
+        """
+        if self._shape is not None:
+            self._shape = SUSPECT
+
+    def fingerprint(self) -> int:
+        """
+        Order-sensitive fingerprint of the values: equal lists always have equal fingerprints, and lists that
+        differ almost always have different ones
+        :returns: the fingerprint, or None unless the DLL was built with fingerprint=True
+        """
+        return None if self._fingerprint is None else self._fingerprint[0]
+
+    def _fingerprint_add(self, run: Tuple[int, int], sign: int = 1) -> None:
+        """
+        Adds (or with sign -1, takes away) the contribution of a run of values linked into the DLL
+        :param run: forward and backward contributions from _fingerprint_run
+        :param sign: 1 when the run is linked, -1 when it is unlinked
+        :returns: None
+        """
+        self._fingerprint[0] = (self._fingerprint[0] + sign * run[0]) & _FINGERPRINT_MASK
+        self._fingerprint[1] = (self._fingerprint[1] + sign * run[1]) & _FINGERPRINT_MASK
+
+    def _fingerprint_unlink(self, node: Node) -> None:
+        """
+        Takes a node about to be unlinked out of the fingerprint
+        :param node: a Node currently linked in the DLL
+        :returns: None
+        """
+        before = _EDGE if node is self.head else node.prev.value
+        after = _EDGE if node is self.tail else node.next.value
+        self._fingerprint_add(_fingerprint_run((node.value,), before, after), -1)
+
+    def _swap_ends(self) -> None:
+        """
+        Swaps head and tail, and the forward and backward fingerprints with them
+        :returns: None
+        """
+        self.head, self.tail = self.tail, self.head
+        if self._fingerprint is not None:
+            self._fingerprint.reverse()
+
+    def _physically(self, method: Callable, *args) -> T:
+        """
+        Runs a DLL method on a flipped DLL as if it were not flipped, i.e. against the physical Node.next/prev
+        orientation, with head and tail swapped to match; the index and skip layer follow that orientation too
+        :param method: bound DLL method to run
+        :param args: positional arguments for method, already translated to the physical orientation
+        :returns: whatever method returns
+        """
+        self._swap_ends()
+        self._flipped = False
+        try:
+            return method(*args)
+        finally:
+            self._swap_ends()
+            self._flipped = True
+
+    def materialize(self) -> None:
+        """
+        Rewires the Nodes of a flipped lazy_reverse DLL so Node.next/prev agree with head-to-tail order again;
+        O(n) once per flip, a no-op otherwise. Call it before walking Node links directly
+        :returns: None
+        """
+        if self._flipped:
+            self._swap_ends()
+            self._flipped = False
+            self._reverse_links()
+
+    def push(self, val: T, back: bool = True) -> Node:
+        """
+        Adds a new node to the back or front of an existing DLL
+        :param val: val of the new node to be added
+        :param back: boolean indicating adding new node to front (False) or back (True)
+        :returns: the new Node, a handle for move_to_front, move_to_back and unlink
+        """
+        if self._flipped:
+            return self._physically(self.push, val, not back)
+        if self._fingerprint is not None:
+            neighbour = self.tail if back else self.head
+            edge = _EDGE if neighbour is None else neighbour.value
+            self._fingerprint_add(_fingerprint_run((val,), edge, _EDGE) if back else
+                                  _fingerprint_run((val,), _EDGE, edge))
+        new_node = Node(val) if self._pool is None else self._pool.acquire(val)
+        if self._shape is not None:
+            self._reshaped()
+        if self._index is not None:
+            self._index_add(new_node, back)
+        if self._skip is not None:
+            self._skip.insert(self.size if back else 0, new_node)
+        if not self.empty():
+            if back == True:
+                if self.head is self.tail:
+                    self.head.next = new_node
+                new_node.prev = self.tail
+                self.tail.next = new_node
+                self.tail = new_node
+            else:
+                self.head.prev = new_node
+                new_node.next = self.head
+                self.head = new_node
+        else:
+            self.head = new_node
+            self.tail = new_node
+        if self._size is not None:
+            self._size += 1
+        return new_node
+
+    def pop(self, back: bool = True) -> None:
+        """
+        Removes the first or last Node from a DLL dependent on param: back
+        :param back: boolean indicating removal from front (False) or back (True)
+        :returns: None
+        """
+        if self._flipped:
+            return self._physically(self.pop, not back)
+        if not self.empty():
+            removed = self.tail if back else self.head
+            if self._fingerprint is not None:
+                self._fingerprint_unlink(removed)
+            if self._shape is not None:
+                self._reshaped()
+            if self._index is not None:
+                self._index_discard(removed)
+            if self._skip is not None:
+                self._skip.delete(self.size - 1 if back else 0)
+            if removed is self.head and removed is self.tail:  # remove last el
+                self.head = None
+                self.tail = None
 
-    if not lst.empty():
-        if lst.head.next is not None and lst.head.next.next is not None:
-            slow = lst.head
-            fast = lst.head
-            if slow == fast:
-                if lst.size == 1:
-                    return True
+            elif back == True:  # remove at back
+                self.tail = removed.prev
+                if removed.next is self.head:  # keep a closed playlist closed
+                    self.tail.next = self.head
+                    self.head.prev = self.tail
                 else:
-                    return connect_list(slow, fast)
+                    self.tail.next = None
 
-            return connect_list(slow, fast)
+            else:  # remove at front
+                self.head = removed.next
+                if removed.prev is self.tail:  # keep a closed playlist closed
+                    self.head.prev = self.tail
+                    self.tail.next = self.head
+                else:
+                    self.head.prev = None
 
+            if self._size is not None:
+                self._size -= 1
+            if self._pool is not None:
+                self._pool.release(removed)
         else:
-            fix_playlist_helper()
-            return True
-    else:
-        return True
+            return
+
+    def _link_chain(self, source: Iterable[T], back: bool = True) -> Tuple[Node, Node, int]:
+        """
+        Builds a detached chain of Nodes from source in a single pass
+        :param source: iterable of values
+        :param back: boolean indicating values are chained in order (True) or each before the
+            previous one (False), as repeated front pushes would
+        :returns: tuple of the first Node, last Node and Node count; (None, None, 0) for no values
+        """
+        values = iter(source)
+        for val in values:
+            break
+        else:
+            return None, None, 0
+
+        if self._pool is None and self._index is None and back:
+            first = last = Node(val)
+            count = 1
+            for val in values:
+                node = Node(val, None, last)
+                last.next = node
+                last = node
+                count += 1
+            return first, last, count
+
+        make = Node if self._pool is None else self._pool.acquire
+        first = last = make(val)
+        if self._index is not None:
+            self._index_add(first, back)
+        count = 1
+        for val in values:
+            node = make(val)
+            if self._index is not None:
+                self._index_add(node, back)
+            if back:
+                node.prev = last
+                last.next = node
+                last = node
+            else:
+                node.next = first
+                first.prev = node
+                first = node
+            count += 1
+        return first, last, count
+
+    def list_to_dll(self, source: List[T]) -> None:
+        """
+        Takes a python list (or any iterable) and replaces the DLL contents with its values
+        :param source: python list to be converted
+        :returns: None
+        """
+        if self._index is not None:
+            self._index.clear()
+        if self._shape is not None:
+            self._shape = LINEAR
+        if self._flipped:
+            self._flipped = False
+        self.head, self.tail, self._size = self._link_chain(source)
+        if self._skip is not None:
+            self._skip.rebuild(self.iter_nodes())
+        if self._fingerprint is not None:
+            self._fingerprint[:] = [_EMPTY_FINGERPRINT] * 2
+            self._fingerprint_add(_fingerprint_run(node.value for node in self.iter_nodes()))
+
+    def extend(self, source: Iterable[T]) -> None:
+        """
+        Links the values of source onto the back of the DLL, in order
+        :param source: iterable of values to be added
+        :returns: None
+        """
+        if self._flipped:
+            return self._physically(self.extendleft, source)
+        first, last, count = self._link_chain(source)
+        if count == 0:
+            return
+        if self._fingerprint is not None:
+            values = (node.value for node in self.iter_nodes(first, count))
+            self._fingerprint_add(_fingerprint_run(values, _EDGE if self.empty() else self.tail.value))
+        if self._shape is not None:
+            self._reshaped()
+        if self._skip is not None:
+            for pos, node in enumerate(self.iter_nodes(first, count), self.size):
+                self._skip.insert(pos, node)
+        if self.empty():
+            self.head = first
+        else:
+            self.tail.next = first
+            first.prev = self.tail
+        self.tail = last
+        if self._size is not None:
+            self._size += count
+
+    def extendleft(self, source: Iterable[T]) -> None:
+        """
+        Links the values of source onto the front of the DLL; like repeated push(val, back=False),
+        the values end up in reverse order
+        :param source: iterable of values to be added
+        :returns: None
+        """
+        if self._flipped:
+            return self._physically(self.extend, source)
+        first, last, count = self._link_chain(source, back=False)
+        if count == 0:
+            return
+        if self._fingerprint is not None:
+            values = (node.value for node in self.iter_nodes(first, count))
+            self._fingerprint_add(_fingerprint_run(values, _EDGE, _EDGE if self.empty() else self.head.value))
+        if self._shape is not None:
+            self._reshaped()
+        if self._skip is not None:
+            for pos, node in enumerate(self.iter_nodes(first, count)):
+                self._skip.insert(pos, node)
+        if self.empty():
+            self.tail = last
+        else:
+            self.head.prev = last
+            last.next = self.head
+        self.head = first
+        if self._size is not None:
+            self._size += count
+
+    def dll_to_list(self) -> List[T]:
+        """
+        Takes a DLL and creates a Python list from its contents
+        :returns: DLL  containing Python list values
+        """
+        if self._flipped:
+            return list(self)
+        ptr = self.head
+        new_list = []
+        if ptr is not None:
+            while ptr is not None:
+                new_list.append(ptr.value)
+                ptr = ptr.next
+            return new_list
+        else:
+            return new_list
+
+    def write_to(self, fp, sep: str = " <-> ", fmt: Callable[[Node], str] = str, chunk: int = 1024) -> int:
+        """
+        Streams the formatted Nodes to a file-like object, head to tail, without building the whole string; with
+        the defaults it writes the untruncated repr
+        :param fp: object with a write(str) method, e.g. a file opened for text
+        :param sep: separator written between Nodes
+        :param fmt: formats one Node, e.g. lambda node: str(node.value) to write bare values
+        :param chunk: number of Nodes formatted per write call
+        :returns: number of Nodes written
+        """
+        count = 0
+        nodes = self.iter_nodes()
+        while True:
+            parts = [fmt(node) for node in islice(nodes, chunk)]
+            if not parts:
+                return count
+            fp.write((sep if count else "") + sep.join(parts))
+            count += len(parts)
+
+    def _node_at(self, i: int) -> Node:
+        """
+        Resolves a position, negative counting from the tail, to its Node; walks from the nearer end
+        unless the DLL is indexable
+        :param i: position of the Node
+        :returns: the Node at position i
+        """
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError("DLL index out of range")
+        if self._flipped:
+            return self._physically(self._node_at, self.size - 1 - i)
+        if self._skip is not None:
+            return self._skip.get(i)
+        if i < self.size // 2:
+            node = self.head
+            for _ in range(i):
+                node = node.next
+        else:
+            node = self.tail
+            for _ in range(self.size - 1 - i):
+                node = node.prev
+        return node
+
+    def __getitem__(self, i: int) -> Node:
+        """
+        Returns the Node at position i; O(log n) when indexable, else O(min(i, n - i))
+        :param i: position of the Node, negative counting from the tail
+        :returns: the Node at position i
+        """
+        return self._node_at(i)
+
+    def __delitem__(self, i: int) -> None:
+        """
+        Removes the Node at position i; O(log n) when indexable, else O(min(i, n - i))
+        :param i: position of the Node, negative counting from the tail
+        :returns: None
+        """
+        self._remove_node(self._node_at(i))
+
+    def insert(self, i: int, val: T) -> Node:
+        """
+        Adds a new node holding val so that it ends up at position i, like list.insert
+        :param i: position of the new node; clamped to the ends of the DLL, negative counting from the tail
+        :param val: val of the new node to be added
+        :returns: the new Node
+        """
+        if i < 0:
+            i = max(i + self.size, 0)
+        if self._flipped:
+            return self._physically(self.insert, self.size - min(i, self.size), val)
+        if i >= self.size:
+            return self.push(val)
+        if i == 0:
+            return self.push(val, back=False)
+
+        after = self._node_at(i)
+        if self._fingerprint is not None:
+            self._fingerprint_add(_fingerprint_run((val,), after.prev.value, after.value))
+        new_node = Node(val) if self._pool is None else self._pool.acquire(val)
+        if self._shape is not None:
+            self._reshaped()
+        new_node.prev, new_node.next = after.prev, after
+        after.prev.next = new_node
+        after.prev = new_node
+        self.size += 1
+        if self._skip is not None:
+            self._skip.insert(i, new_node)
+        if self._index is not None:
+            self._index_insert(new_node)
+        return new_node
+
+    def index(self, node: Node) -> int:
+        """
+        Finds the position of a node of the DLL; O(log n) when indexable, else O(n)
+        :param node: a Node currently linked in the DLL
+        :returns: 0-based position of node
+        """
+        if self._flipped:
+            return self.size - 1 - self._physically(self.index, node)
+        if self._skip is not None:
+            if node not in self._skip:
+                raise ValueError(f"{node} is not in DLL")
+            return self._skip.rank(node)
+        for i, other in enumerate(self.iter_nodes()):
+            if other is node:
+                return i
+        raise ValueError(f"{node} is not in DLL")
+
+    def iter_nodes(self, start_node: Node = None, limit: int = None, reverse: bool = False) -> Iterator[Node]:
+        """
+        Lazily yields the Nodes of the DLL without building a list. Stops at the end of the list,
+        after limit Nodes, or on arriving back at the first Node yielded (so a circular playlist is
+        walked exactly once). Pass limit to bound a walk over an improper loop.
+        :param start_node: Node to start from; defaults to head (tail when reverse)
+        :param limit: maximum number of Nodes to yield, or None for no bound
+        :param reverse: boolean indicating walking forward via next (False) or backward via prev (True)
+        :returns: iterator over the Nodes
+        """
+        if start_node is None:
+            start_node = self.tail if reverse else self.head
+        if self._flipped:
+            reverse = not reverse
+        node = start_node
+        remaining = -1 if limit is None else limit
+        while node is not None and remaining != 0:
+            yield node
+            remaining -= 1
+            node = node.prev if reverse else node.next
+            if node is start_node:
+                break
+
+    def _find_nodes(self, val: T, find_first: bool = False) -> List[Node]:
+        """
+        Finds nodes from a DLL with the same value of param val; will find all nodes dependent on find-first
+        :param val: the value to be found
+        :param find_first: boolean indicating to find 1 Node (True) or all Nodes (False)
+        :returns: a list of all the nodes, 1 Node or None (value not found)
+        """
+        if self._index is not None:
+            try:
+                bucket = self._index.get(val)
+            except TypeError:  # unhashable values can never be in the index
+                bucket = None
+            if not bucket:
+                return None
+            if self._flipped:
+                return [bucket[-1]] if find_first else list(reversed(bucket))
+            return [bucket[0]] if find_first else list(bucket)
+
+        if self._flipped:
+            new_list = []
+            for node in self.iter_nodes():
+                if node.value == val:
+                    new_list.append(node)
+                    if find_first:
+                        break
+            return new_list or None
+
+        ptr = self.head
+        new_list = []
+        if ptr is not None:
+            tail = self.tail  # stopping at the tail also walks a closed playlist just once
+            while True:
+                if ptr.value == val:
+                    new_list.append(ptr)
+                    if find_first == True:
+                        return new_list
+                if ptr is tail:
+                    break
+                ptr = ptr.next
+
+            if len(new_list) != 0:
+                return new_list
+
+        else:
+            return None
+
+    def find(self, val: T) -> Node:
+        """
+        Calls _find_nodes to find the first occurrence of a Node with value val
+        :param val: the node value to be found
+        :returns: The node found or None
+        """
+        value = self._find_nodes(val, True)
+        if value is not None:
+            return value[0]
+        else:
+            return None
+
+    def find_all(self, val: T) -> List[Node]:
+        """
+        Finds all node instances within a DLL
+        :param val: node value to be searched for
+        :return: a python list containing the node objects or an empty list if not found
+        """
+        value = self._find_nodes(val)
+        if value is not None:
+            return value
+        else:
+            return []
+
+    def _remove_node(self, to_remove: Node) -> None:
+        """
+        Removes the node passed as a param
+        :param to_remove: a reference to the node to be removed
+        :returns: None
+        """
+        if self._flipped:
+            return self._physically(self._remove_node, to_remove)
+        if self._fingerprint is not None:
+            self._fingerprint_unlink(to_remove)
+        if self._shape is not None:
+            self._reshaped()
+        if self._index is not None:
+            self._index_discard(to_remove)
+        if self._skip is not None:
+            self._skip.discard(to_remove)
+
+        if self.head is to_remove:  # remove from front
+            if self.head is self.tail:
+                self.head = None
+                self.tail = None
+            else:
+                self.head = to_remove.next
+                if to_remove.prev is self.tail:  # keep a closed playlist closed
+                    self.head.prev = self.tail
+                    self.tail.next = self.head
+                else:
+                    self.head.prev = None
+
+        elif self.tail is to_remove:  # remove from end
+            self.tail = to_remove.prev
+            if to_remove.next is self.head:  # keep a closed playlist closed
+                self.tail.next = self.head
+                self.head.prev = self.tail
+            else:
+                self.tail.next = None
+
+        elif self._size == 1 and self.head is to_remove:  # remove last el
+            self.head = None
+            self.tail = None
+
+        else:
+            to_remove.next.prev = to_remove.prev
+            to_remove.prev.next = to_remove.next
+        if self._size is not None:
+            self._size -= 1
+        if self._pool is not None:
+            self._pool.release(to_remove)
+
+    def unlink(self, node: Node) -> T:
+        """
+        Removes a node of the DLL through its handle in O(1) (O(log n) when indexable)
+        :param node: a Node currently linked in the DLL, e.g. as returned by push
+        :returns: the value the node held
+        """
+        val = node.value
+        self._remove_node(node)
+        return val
+
+    def _move(self, node: Node, back: bool) -> None:
+        """
+        Relinks a node of the DLL at the back or front without allocating or releasing a Node
+        :param node: a Node currently linked in the DLL
+        :param back: boolean indicating moving to the front (False) or back (True)
+        :returns: None
+        """
+        if self._flipped:
+            return self._physically(self._move, node, not back)
+        if node is (self.tail if back else self.head):
+            return
+        if self._shape is not None:
+            self._reshaped()
+        if self._fingerprint is not None:
+            self._fingerprint_unlink(node)
+        if self._index is not None:
+            self._index_discard(node)
+        if self._skip is not None:
+            self._skip.discard(node)
+
+        if node is self.head:
+            self.head = node.next
+            self.head.prev = None
+        elif node is self.tail:
+            self.tail = node.prev
+            self.tail.next = None
+        else:
+            node.prev.next = node.next
+            node.next.prev = node.prev
+
+        if self._fingerprint is not None:
+            edge = (self.tail if back else self.head).value
+            self._fingerprint_add(_fingerprint_run((node.value,), edge, _EDGE) if back else
+                                  _fingerprint_run((node.value,), _EDGE, edge))
+        if self._index is not None:
+            self._index_add(node, back)
+        if self._skip is not None:
+            self._skip.insert(self.size - 1 if back else 0, node)
+        if back:
+            node.prev, node.next = self.tail, None
+            self.tail.next = node
+            self.tail = node
+        else:
+            node.prev, node.next = None, self.head
+            self.head.prev = node
+            self.head = node
+
+    def move_to_front(self, node: Node) -> None:
+        """
+        Makes a node of the DLL its head in O(1) (O(log n) when indexable); the Node itself is kept
+        :param node: a Node currently linked in the DLL, e.g. as returned by push
+        :returns: None
+        """
+        self._move(node, back=False)
+
+    def move_to_back(self, node: Node) -> None:
+        """
+        Makes a node of the DLL its tail in O(1) (O(log n) when indexable); the Node itself is kept
+        :param node: a Node currently linked in the DLL, e.g. as returned by push
+        :returns: None
+        """
+        self._move(node, back=True)
+
+    def remove(self, val: T) -> bool:
+        """
+        Removes the first instance of a node with value val
+        :param val: the value to be removed from the DLL
+        :return: A boolean; True if successful, False otherwise
+        """
+        value = self.find(val)
+        if value is not None:
+            self._remove_node(value)
+            return True
+        else:
+            return False
+
+    def remove_all(self, val: T) -> int:
+        """
+        Removes all node instances with the value passed to the functions
+        :param val: the value to be removed from the DLL
+        :return: An int representing the number of Nodes removed
+        """
+        circular = self._circular()
+        self._open()
+        if self._index is not None:
+            value = self.find_all(val)
+            for node in value:
+                self._remove_node(node)
+            count = len(value)
+        else:
+            count = 0
+            node = self.head
+            while node is not None:
+                after = node.next
+                if node.value == val:
+                    self._remove_node(node)
+                    count += 1
+                node = after
+        if circular and self.head is not None:
+            self._close()
+        return count
+
+    def remove_many(self, values: Iterable[T]) -> int:
+        """
+        Removes all node instances whose value is any of values, in a single traversal
+        :param values: the values to be removed from the DLL; unhashable values are compared one by one
+        :return: An int representing the number of Nodes removed
+        """
+        hashable, banned = _value_matcher(values)
+        if self._index is not None:
+            return sum(self.remove_all(val) for val in hashable)
+        return self.remove_if(banned)
+
+    def remove_if(self, predicate: Callable[[T], bool]) -> int:
+        """
+        Removes all node instances whose value satisfies predicate, in a single traversal
+        :param predicate: function called once per value, head to tail; truthy results are removed
+        :return: An int representing the number of Nodes removed
+        """
+        circular = self._circular()
+        self._open()
+        count = 0
+        node = self.head
+        while node is not None:
+            after = node.next
+            if predicate(node.value):
+                self._remove_node(node)
+                count += 1
+            node = after
+        if circular and self.head is not None:
+            self._close()
+        return count
+
+    def dedupe(self, key: Callable[[T], object] = None, keep: str = "first") -> int:
+        """
+        Removes repeated values in a single traversal, remembering the keys seen in a set; unhashable keys are
+        compared one by one. The Nodes kept stay in order. An indexed DLL without a key only visits its duplicates
+        :param key: function of one value returning what makes two values duplicates; None uses the values
+        :param keep: "first" to keep the first occurrence of each key, or "last" to keep the last
+        :return: An int representing the number of Nodes removed
+        """
+        if keep not in ("first", "last"):
+            raise ValueError(f'keep must be "first" or "last", not {keep!r}')
+        circular = self._circular()
+        self._open()
+        count = 0
+        if key is None and self._index is not None:
+            for bucket in list(self._index.values()):
+                while len(bucket) > 1:
+                    self._remove_node(bucket[-1] if keep == "first" else bucket[0])
+                    count += 1
+        else:
+            count = self._dedupe_walk(key, keep)
+        if circular:
+            self._close()
+        return count
+
+    def _dedupe_walk(self, key: Callable[[T], object], keep: str) -> int:
+        """
+        Removes repeated keys in one traversal from the end whose occurrences are kept
+        :param key: function of one value returning its key, or None to use the values
+        :param keep: "first" to walk from the head, "last" to walk from the tail
+        :return: An int representing the number of Nodes removed
+        """
+        count = 0
+        seen, unhashable = set(), []
+        node = self.head if keep == "first" else self.tail
+        while node is not None:
+            after = node.next if keep == "first" else node.prev
+            item = node.value if key is None else key(node.value)
+            try:
+                duplicate = item in seen
+                seen.add(item)
+            except TypeError:
+                duplicate = item in unhashable
+                if not duplicate:
+                    unhashable.append(item)
+            if duplicate:
+                self._remove_node(node)
+                count += 1
+            node = after
+        return count
+
+    def reverse(self) -> None:
+        """
+        Reorders a DLL in the reverse order; O(1) on a lazy_reverse DLL, which only flips its orientation
+        :returns: None
+        """
+        if self._shape is not None:
+            self._reshaped()
+        if self._flipped is not None:
+            self._swap_ends()
+            self._flipped = not self._flipped
+        else:
+            self._reverse_links()
+
+    def _reverse_links(self) -> None:
+        """
+        Swaps next and prev on every Node, then head and tail, keeping the index and skip layer in order
+        :returns: None
+        """
+        if not self.empty():
+            temp = None
+            ptr = self.head
+            while ptr is not None:
+                next = ptr.prev
+                prev = ptr.next
+                ptr.next = next
+                ptr.prev = prev
+                ptr = prev
+                if ptr is self.head:
+                    break
+
+            self._swap_ends()
+
+            if self._index is not None:
+                for bucket in self._index.values():
+                    bucket.reverse()
+            if self._skip is not None:
+                self._skip.rebuild(self.iter_nodes())
+
+    def _open(self) -> None:
+        """
+        Prepares the DLL for chains of Nodes to be relinked in or out: undoes a lazy reversal and opens a closed
+        playlist, leaving it linear
+        :returns: None
+        """
+        self.materialize()
+        if self.head is not None:
+            self.head.prev = self.tail.next = None
+        if self._shape is not None:
+            self._shape = LINEAR
+
+    def _close(self) -> None:
+        """
+        Closes the DLL into a loop, as fix_playlist would, e.g. a playlist after _open
+        :returns: None
+        """
+        self.head.prev, self.tail.next = self.tail, self.head
+        if self._shape is not None:
+            self._shape = CIRCULAR
+
+    def _make_indexable(self) -> None:
+        """
+        Builds the skip layer of a DLL constructed without indexable=True, in O(n), so it behaves as if it had
+        been indexable from the start and positional access is O(log n) from now on
+        :returns: None
+        """
+        if self._skip is None:
+            self.materialize()
+            self._skip = _SkipLayer()
+            self._skip.rebuild(self.iter_nodes())
+
+    def _relinked(self) -> None:
+        """
+        Rebuilds the value index and skip layer after chains of Nodes were relinked; O(n), and only for a DLL
+        built with those features
+        :returns: None
+        """
+        if self._index is not None:
+            self._index.clear()
+            for node in self.iter_nodes():
+                self._index_add(node)
+        if self._skip is not None:
+            self._skip.rebuild(self.iter_nodes())
+
+    def _cut(self, first: Node, last: Node, count: int) -> None:
+        """
+        Unlinks the chain of Nodes first .. last from the DLL, leaving it detached with no outer links
+        :param first: first Node of the chain
+        :param last: last Node of the chain, first or linked after it
+        :param count: number of Nodes in the chain, or None to defer the size until it is next used
+        :returns: None
+        """
+        before, after = first.prev, last.next
+        if self._fingerprint is not None:
+            values = (node.value for node in _chain(first, last))
+            self._fingerprint_add(_fingerprint_run(values, _EDGE if before is None else before.value,
+                                                   _EDGE if after is None else after.value), -1)
+        if before is None:
+            self.head = after
+        else:
+            before.next = after
+        if after is None:
+            self.tail = before
+        else:
+            after.prev = before
+        first.prev = last.next = None
+        if self.head is None:
+            self._size = 0
+        elif count is None or self._size is None:
+            self._size = None
+        else:
+            self._size -= count
+
+    def _graft(self, first: Node, last: Node, count: int, after: Node) -> None:
+        """
+        Links a detached chain of Nodes first .. last into the DLL
+        :param first: first Node of the chain
+        :param last: last Node of the chain
+        :param count: number of Nodes in the chain, or None to defer the size until it is next used
+        :param after: Node of this DLL to link the chain after, or None to link it at the front
+        :returns: None
+        """
+        before, after = after, (self.head if after is None else after.next)
+        if self._fingerprint is not None:
+            values = (node.value for node in _chain(first, last))
+            self._fingerprint_add(_fingerprint_run(values, _EDGE if before is None else before.value,
+                                                   _EDGE if after is None else after.value))
+        first.prev, last.next = before, after
+        if before is None:
+            self.head = first
+        else:
+            before.next = first
+        if after is None:
+            self.tail = last
+        else:
+            after.prev = last
+        self._size = None if count is None or self._size is None else self._size + count
+
+    def concat(self, other: DLL) -> None:
+        """
+        Moves every Node of other onto the back of this DLL by relinking the two ends in O(1), leaving other empty
+        :param other: another DLL; its Nodes are reused, not copied
+        :returns: None
+        """
+        if other is self:
+            raise ValueError("cannot concat a DLL onto itself")
+        self._open()
+        other._open()
+        if other.head is None:
+            return
+        first, last, count = other.head, other.tail, other._size
+        other._cut(first, last, count)
+        self._graft(first, last, count, self.tail)
+        self._relinked()
+        other._relinked()
+
+    def split_after(self, node: Node, count: int = None) -> DLL:
+        """
+        Cuts the DLL after node in O(1), moving the Nodes that follow it into a new DLL
+        :param node: a Node of this DLL; it stays as the new tail
+        :param count: number of Nodes after node, if known; without it both sizes are counted when next used
+        :returns: a new DLL with the same options and pool, holding the Nodes after node
+        """
+        result = type(self)(pool=self._pool, **self._options())
+        self._open()
+        if node.next is not None:
+            first, last = node.next, self.tail
+            self._cut(first, last, count)
+            result._graft(first, last, count, None)
+            self._relinked()
+            result._relinked()
+        return result
+
+    def splice(self, node_a: Node, node_b: Node, dest: DLL, after: Node = None, count: int = None) -> None:
+        """
+        Moves the Nodes node_a .. node_b of this DLL into dest after a Node of dest, relinking them in O(1).
+        dest may be this DLL, provided after is not one of the Nodes moved
+        :param node_a: first Node to move
+        :param node_b: last Node to move; node_a itself or a Node after it
+        :param dest: DLL receiving the Nodes
+        :param after: Node of dest to link them after, or None to link them at the front of dest
+        :param count: number of Nodes moved, if known; without it both sizes are counted when next used
+        :returns: None
+        """
+        self._open()
+        dest._open()
+        size = self._size
+        self._cut(node_a, node_b, count)
+        dest._graft(node_a, node_b, count, after)
+        if dest is self:
+            self._size = size
+        else:
+            dest._relinked()
+        self._relinked()
+
+    def sort(self, key: Callable[[T], object] = None, reverse: bool = False) -> None:
+        """
+        Sorts the DLL in place, stably, by relinking its Nodes: a bottom-up merge sort taking O(n log n)
+        comparisons and O(1) extra links, so Node handles stay valid and no values are copied. A key function is
+        called once per Node. A closed playlist stays closed
+        :param key: function of one value returning its sort key, like list.sort; None compares values directly
+        :param reverse: boolean indicating sorting in descending (True) or ascending (False) order; equal values
+            keep their order either way
+        :returns: None
+        """
+        circular = self._circular()
+        self._open()
+        keys = None if key is None else {id(node): key(node.value) for node in self.iter_nodes()}
+        before = operator.gt if reverse else operator.lt  # True when the right run's Node goes first
+        head, last = self.head, None
+        width = 1
+        while head is not None:
+            first = last = None
+            merges = 0
+            left = head
+            while left is not None:
+                merges += 1
+                right = left
+                left_size = 0
+                while left_size < width and right is not None:
+                    left_size += 1
+                    right = right.next
+                right_size = width
+                while left_size > 0 or (right_size > 0 and right is not None):
+                    if left_size == 0:
+                        take_right = True
+                    elif right_size == 0 or right is None:
+                        take_right = False
+                    elif keys is None:
+                        take_right = before(right.value, left.value)
+                    else:
+                        take_right = before(keys[id(right)], keys[id(left)])
+                    if take_right:
+                        node, right = right, right.next
+                        right_size -= 1
+                    else:
+                        node, left = left, left.next
+                        left_size -= 1
+                    node.prev = last
+                    if last is None:
+                        first = node
+                    else:
+                        last.next = node
+                    last = node
+                left = right
+            last.next = None
+            head = first
+            if merges <= 1:
+                break
+            width *= 2
+        self.head, self.tail = head, last
+        self._relinked()
+        if self._fingerprint is not None:
+            self._fingerprint[:] = [_EMPTY_FINGERPRINT] * 2
+            self._fingerprint_add(_fingerprint_run(node.value for node in self.iter_nodes()))
+        if circular:
+            self._close()
+
+    def insert_sorted(self, val: T, key: Callable[[T], object] = None, reverse: bool = False) -> Node:
+        """
+        Adds val to a DLL sorted with the same key and reverse, after any equal values, keeping it sorted.
+        O(1) when val belongs at the back, O(log^2 n) to find its place when indexable, else O(n)
+        :param val: val of the new node to be added
+        :param key: function of one value returning its sort key; None compares values directly
+        :param reverse: boolean indicating the DLL is sorted in descending (True) or ascending (False) order
+        :returns: the new Node
+        """
+        def after(node: Node) -> bool:
+            """
+            :return: True if val belongs after node, i.e. node does not sort after val
+            """
+            node_key = node.value if key is None else key(node.value)
+            return target <= node_key if reverse else node_key <= target
+
+        target = val if key is None else key(val)
+        if self.empty() or after(self.tail):
+            return self.push(val)
+        if self._skip is not None:
+            lo, hi = 0, self.size - 1  # val belongs before the tail
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if after(self._node_at(mid)):
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return self.insert(lo, val)
+        for pos, node in enumerate(self.iter_nodes()):
+            if not after(node):
+                return self.insert(pos, val)
+
+
+def _chain(first: Node, last: Node) -> Iterator[Node]:
+    """
+    :param first: first Node of a chain
+    :param last: last Node of the chain, reached from first through next links
+    :return: iterator over the Nodes first .. last
+    """
+    node = first
+    while True:
+        yield node
+        if node is last:
+            return
+        node = node.next
+
+
+def fix_playlist(lst: DLL) -> bool:
+    """
+    Checks a playlist modelded by a DLL to see if it is broken, has an improper loop, or is fixed; will fix a broken
+    list, but not an improper one. A DLL built with track_shape=True answers in O(1) when its shape is already known.
+    :param lst: The DLL list to be checked
+    :return: A boolean True if the playlist is functional, or it was fixed by the program, returns False if it is
+    improper
+    """
+
+    def connect_list(slow, fast) -> bool:
+        """
+        Contains the while loop creating Floyd's Cycle Finding Algorithm, will fix a broken loop
+        :param slow: a pointer to a node incremented by 1 every loop
+        :param fast: a pointer to a node incremented by 2 every loop
+        :return: A boolean, True if proper, False if improper
+        """
+
+        proper = False
+        while fast is not None and fast.next is not None:
+            fast = fast.next.next
+            slow = slow.next
+            if fast is None:
+                fix_playlist_helper()
+                return True
+            if fast is lst.head or fast.next is lst.head:
+                return True
+            if fast is slow:
+                return False
+        lst.head.prev = lst.tail
+        lst.tail.next = lst.head
+        return True
+
+    def fix_playlist_helper():
+        """
+        Sets the head and tail next/prev to the correct nodes; also handles DLL of size 1
+        :returns: None
+        """
+        if lst.size == 1:
+            lst.head.next = lst.head
+            lst.head.prev = lst.head
+        else:
+            lst.head.prev = lst.tail
+            lst.tail.next = lst.head
+
+    def check() -> bool:
+        """
+        Runs the check from scratch
+        :return: A boolean True if proper or fixed, False if improper
+        """
+        if not lst.empty():
+            if lst.head.next is not None and lst.head.next.next is not None:
+                slow = lst.head
+                fast = lst.head
+                if slow == fast:
+                    if lst.size == 1:
+                        return True
+                    else:
+                        return connect_list(slow, fast)
+
+                return connect_list(slow, fast)
+
+            else:
+                fix_playlist_helper()
+                return True
+        else:
+            return True
+
+    def classify() -> bool:
+        """
+        Answers from the tracked shape when there is one, otherwise runs the check
+        :return: A boolean True if proper or fixed, False if improper
+        """
+        lst.materialize()
+        if lst._shape is None:
+            return check()
+        if lst._shape is CIRCULAR or (lst._shape is LINEAR and lst.empty()):
+            return True
+        if lst._shape is IMPROPER:
+            return False
+        if lst._shape is LINEAR:
+            fix_playlist_helper()
+            proper = True
+        else:
+            proper = check()
+        lst._shape = CIRCULAR if proper else IMPROPER
+        return proper
+
+    if instrumentation.enabled:
+        return instrumentation.call("fix_playlist", classify)
+    return classify()
+
+
+def diagnose_playlist(lst: DLL) -> dict:
+    """
+    Classifies a playlist without changing its links in O(size) forward links: Floyd's algorithm is capped at
+    size + 1 rounds, so a loop or a chain longer than size is reported rather than walked. A lazily reversed DLL
+    is walked through prev rather than materialized. Only records the shape, on a DLL built with track_shape=True.
+    :param lst: The DLL list to be checked
+    :return: dict with "state" (LINEAR, CIRCULAR, IMPROPER or SUSPECT when the links disagree with size),
+        "nodes" (distinct Nodes reachable from head, or None when the cap was hit), "cycle_entry" (the Node
+        where the forward links loop back, or None), "cycle_length" (Nodes on that loop, 0 when linear)
+        and "steps" (forward links followed)
+    """
+    step = operator.attrgetter("prev" if lst._flipped else "next")
+    report = {"state": SUSPECT, "nodes": None, "cycle_entry": None, "cycle_length": 0, "steps": 0}
+    bound = lst.size + 1
+    slow = fast = lst.head
+    meeting = None
+    rounds = 0
+    while fast is not None and step(fast) is not None and rounds < bound:
+        fast = step(step(fast))
+        slow = step(slow)
+        report["steps"] += 3
+        rounds += 1
+        if fast is slow:
+            meeting = fast
+            break
+
+    if meeting is not None:
+        entry = lst.head
+        mu = 0
+        while entry is not meeting:  # both pointers reach the loop entry together
+            entry = step(entry)
+            meeting = step(meeting)
+            mu += 1
+            report["steps"] += 2
+        length = 1
+        node = step(entry)
+        while node is not entry:
+            node = step(node)
+            length += 1
+            report["steps"] += 1
+        report["cycle_entry"], report["cycle_length"] = entry, length
+        report["nodes"] = mu + length
+        report["state"] = CIRCULAR if entry is lst.head else IMPROPER
+    elif fast is None or step(fast) is None:
+        count = 2 * rounds + (0 if fast is None else 1)
+        report["nodes"] = count
+        report["state"] = LINEAR
+
+    if report["nodes"] != lst.size:
+        report["state"] = SUSPECT
+    if lst._shape is not None:
+        lst._shape = report["state"]
+    return report
+
+
+class PlaylistCursor:
+    """
+    Playback position over a playlist DLL. Moves wrap from tail to head and back, so the cursor works the
+    same on a playlist closed by fix_playlist and on a linear one.
+    """
+    __slots__ = ["playlist", "node"]
+
+    def __init__(self, playlist: DLL, node: Node = None) -> None:
+        """
+        Construct a cursor.
+
+        :param playlist: the DLL being played.
+        :param node: Node to start on; defaults to the playlist head.
+        :return: None.
+        """
+        self.playlist = playlist
+        self.node = playlist.head if node is None else node
+
+    def __repr__(self) -> str:
+        """
+        Represents the cursor as a string.
+
+        :return: string representation of the cursor.
+        """
+        return f"PlaylistCursor({self.node})"
+
+    def next(self) -> Node:
+        """
+        Advances to the following track in O(1)
+        :returns: the new current Node, or None for an empty playlist
+        """
+        if self.node is not None:
+            after = self.node.prev if self.playlist._flipped else self.node.next
+            self.node = after if after is not None else self.playlist.head
+        return self.node
+
+    def prev(self) -> Node:
+        """
+        Steps back to the preceding track in O(1)
+        :returns: the new current Node, or None for an empty playlist
+        """
+        if self.node is not None:
+            before = self.node.next if self.playlist._flipped else self.node.prev
+            self.node = before if before is not None else self.playlist.tail
+        return self.node
+
+    def seek_to(self, node: Node) -> Node:
+        """
+        Jumps to a Node of the playlist in O(1)
+        :param node: the Node to play next
+        :returns: node
+        """
+        self.node = node
+        return node
+
+    def skip(self, k: int) -> Node:
+        """
+        Moves k tracks forward (backward for negative k), wrapping around, walking whichever way round the
+        playlist is shorter: O(min(k, n - k)) for a playlist of size n
+        :param k: number of tracks to move
+        :returns: the new current Node, or None for an empty playlist
+        """
+        n = self.playlist.size
+        if self.node is None or n == 0:
+            return self.node
+        k %= n
+        if k <= n - k:
+            for _ in range(k):
+                self.next()
+        else:
+            for _ in range(n - k):
+                self.prev()
+        return self.node
+
+    def shuffle(self, seed: int = None) -> Iterator[Node]:
+        """
+        Lazily plays every track once in a random order, moving the cursor onto each. Uses an incremental
+        Fisher-Yates shuffle over positions that only remembers displaced positions, so k tracks into the
+        shuffle it holds O(k) extra entries rather than a copy of the playlist. Each track is located with
+        playlist[i] in O(log n): a playlist built without indexable=True gets its skip layer in O(n) when the
+        shuffle starts, and keeps it.
+        :param seed: seed for a reproducible order
+        :returns: iterator over the Nodes in shuffled order
+        """
+        self.playlist._make_indexable()
+        rng = Random(seed)
+        n = self.playlist.size
+        displaced = {}
+        for i in range(n):
+            j = rng.randrange(i, n)
+            pick = displaced.get(j, j)
+            if j != i:
+                displaced[j] = displaced.get(i, i)
+            displaced.pop(i, None)
+            self.node = self.playlist[pick]
+            yield self.node
+
+
+class LRUCache:
+    """
+    Least-recently-used cache mapping keys to values. A dict maps each key to its Node in a DLL kept in recency
+    order, least recent at the head, so get, put and eviction are O(1): a hit moves its Node to the back and an
+    eviction pops the head. Evicted Nodes are recycled through a NodePool for the next new key.
+    """
+    __slots__ = ["maxsize", "hits", "misses", "evictions", "_nodes", "_order"]
+
+    def __init__(self, maxsize: int = 128) -> None:
+        """
+        Construct an empty cache.
+
+        :param maxsize: maximum number of entries; 0 caches nothing.
+        :return: None.
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize must be at least 0")
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._nodes = {}
+        self._order = DLL(pool=NodePool(1))
+
+    def __repr__(self) -> str:
+        """
+        Represents the cache as a string.
+
+        :return: string representation of the cache.
+        """
+        return f"LRUCache(maxsize={self.maxsize}, size={len(self._nodes)})"
+
+    def __len__(self) -> int:
+        """
+        :return: number of entries in the cache
+        """
+        return len(self._nodes)
+
+    def __contains__(self, key) -> bool:
+        """
+        Checks for key without counting a hit or miss or refreshing its recency
+        :param key: the key to look up
+        :return: True if key is cached, False otherwise
+        """
+        return key in self._nodes
+
+    def get(self, key, default: T = None) -> T:
+        """
+        Looks up key, making it the most recently used on a hit
+        :param key: the key to look up
+        :param default: value returned on a miss
+        :return: the cached value, or default
+        """
+        node = self._nodes.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._order.move_to_back(node)
+        return node.value[1]
+
+    def put(self, key, value: T) -> None:
+        """
+        Caches value under key as the most recently used entry, evicting the least recently used one when full
+        :param key: hashable key
+        :param value: value to cache
+        :returns: None
+        """
+        node = self._nodes.get(key)
+        if node is not None:
+            node.value = (key, value)
+            self._order.move_to_back(node)
+            return
+        if self.maxsize == 0:
+            return
+        if len(self._nodes) >= self.maxsize:
+            del self._nodes[self._order.head.value[0]]
+            self._order.pop(back=False)
+            self.evictions += 1
+        self._nodes[key] = self._order.push((key, value))
+
+    def pop(self, key, default: T = None) -> T:
+        """
+        Removes key from the cache
+        :param key: the key to remove
+        :param default: value returned when key is not cached
+        :return: the value cached under key, or default
+        """
+        node = self._nodes.pop(key, None)
+        if node is None:
+            return default
+        return self._order.unlink(node)[1]
+
+    def clear(self) -> None:
+        """
+        Removes every entry; the statistics are kept
+        :returns: None
+        """
+        self._nodes.clear()
+        self._order.list_to_dll(())
+
+    def stats(self) -> dict:
+        """
+        :return: dict with the hit, miss and eviction counts, the number of entries and maxsize
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._nodes),
+                "maxsize": self.maxsize}
+
+
+NIL = -1  # null link for index-linked lists
+
+
+class ArrayDLL:
+    """
+    Doubly linked list stored as parallel slabs indexed by int instead of one Node object per value.
+    Slot i holds its value in a list and its next/prev links in int arrays, with NIL as the null link.
+    Freed slots are recycled through a free list. Nodes are referred to by their int slot.
+    """
+    __slots__ = ["head", "tail", "size", "_values", "_next", "_prev", "_free"]
+
+    def __init__(self) -> None:
+        """
+        Construct an empty array-backed doubly linked list.
+
+        :return: None.
+        """
+        self.head = self.tail = NIL
+        self.size = 0
+        self._values = []
+        self._next = array("q")
+        self._prev = array("q")
+        self._free = []
+
+    def __repr__(self) -> str:
+        """
+        Represent the ArrayDLL as a string, in the same format as DLL.
+
+        :return: string representation of the ArrayDLL, truncated like that of a DLL.
+        """
+        return _bounded_repr((f"Node({str(val)})" for val in self), (f"Node({str(val)})" for val in reversed(self)),
+                             self.size)
+
+    __str__ = __repr__
+
+    def __eq__(self, other: "ArrayDLL") -> bool:
+        """
+        :param other: compares equality with this List
+        :return: True if both lists hold equal values in the same order, otherwise False
+        """
+        if self.size != other.size:
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+    def __len__(self) -> int:
+        """
+        :return: number of values in the list
+        """
+        return self.size
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Yields the values from head to tail
+        :return: iterator over the values of the list
+        """
+        values, nxt = self._values, self._next
+        slot = self.head
+        while slot != NIL:
+            yield values[slot]
+            slot = nxt[slot]
+
+    def __reversed__(self) -> Iterator[T]:
+        """
+        Yields the values from tail to head
+        :return: iterator over the values of the list, backwards
+        """
+        values, prv = self._values, self._prev
+        slot = self.tail
+        while slot != NIL:
+            yield values[slot]
+            slot = prv[slot]
+
+    def value(self, slot: int) -> T:
+        """
+        Returns the value stored in a live slot
+        :param slot: slot returned by find or find_all
+        :return: the value held by that slot
+        """
+        return self._values[slot]
+
+    def _alloc(self, val: T) -> int:
+        """
+        Takes a slot from the free list, or grows the slabs by one slot, and stores val in it
+        :param val: value to be stored
+        :return: the allocated slot
+        """
+        if self._free:
+            slot = self._free.pop()
+            self._values[slot] = val
+            return slot
+        self._values.append(val)
+        self._next.append(NIL)
+        self._prev.append(NIL)
+        return len(self._values) - 1
+
+    def empty(self) -> bool:
+        """
+        :return: True if the list holds no values, False otherwise
+        """
+        return self.head == NIL
+
+    def push(self, val: T, back: bool = True) -> None:
+        """
+        Adds val to the back or front of the list
+        :param val: value to be added
+        :param back: boolean indicating adding to front (False) or back (True)
+        :returns: None
+        """
+        slot = self._alloc(val)
+        nxt, prv = self._next, self._prev
+        if self.head == NIL:
+            nxt[slot] = prv[slot] = NIL
+            self.head = self.tail = slot
+        elif back:
+            nxt[slot] = NIL
+            prv[slot] = self.tail
+            nxt[self.tail] = slot
+            self.tail = slot
+        else:
+            prv[slot] = NIL
+            nxt[slot] = self.head
+            prv[self.head] = slot
+            self.head = slot
+        self.size += 1
+
+    def pop(self, back: bool = True) -> None:
+        """
+        Removes the last or first value of the list; does nothing on an empty list
+        :param back: boolean indicating removal from front (False) or back (True)
+        :returns: None
+        """
+        if self.head != NIL:
+            self._remove_slot(self.tail if back else self.head)
+
+    def list_to_dll(self, source: List[T]) -> None:
+        """
+        Replaces the contents of the list with the values of source
+        :param source: python list of values, in order
+        :returns: None
+        """
+        self.__init__()
+        for val in source:
+            self.push(val)
+
+    def dll_to_list(self) -> List[T]:
+        """
+        :return: python list of the values, head to tail
+        """
+        return list(self)
+
+    def _find_slots(self, val: T, find_first: bool = False) -> List[int]:
+        """
+        Collects the slots holding val, head to tail
+        :param val: the value to be found
+        :param find_first: boolean indicating to stop at the first match (True) or find all (False)
+        :returns: a list of matching slots, possibly empty
+        """
+        values, nxt = self._values, self._next
+        found = []
+        slot = self.head
+        while slot != NIL:
+            if values[slot] == val:
+                found.append(slot)
+                if find_first:
+                    break
+            slot = nxt[slot]
+        return found
+
+    def find(self, val: T) -> int:
+        """
+        :param val: the value to be found
+        :returns: slot of the first occurrence of val, or None
+        """
+        found = self._find_slots(val, True)
+        return found[0] if found else None
+
+    def find_all(self, val: T) -> List[int]:
+        """
+        :param val: the value to be found
+        :return: list of the slots holding val, head to tail
+        """
+        return self._find_slots(val)
+
+    def _remove_slot(self, slot: int) -> None:
+        """
+        Unlinks a live slot and returns it to the free list
+        :param slot: the slot to be removed
+        :returns: None
+        """
+        nxt, prv = self._next, self._prev
+        before, after = prv[slot], nxt[slot]
+        if before == NIL:
+            self.head = after
+        else:
+            nxt[before] = after
+        if after == NIL:
+            self.tail = before
+        else:
+            prv[after] = before
+        self._values[slot] = None
+        self._free.append(slot)
+        self.size -= 1
+
+    def remove(self, val: T) -> bool:
+        """
+        Removes the first occurrence of val
+        :param val: the value to be removed
+        :return: True if a value was removed, False otherwise
+        """
+        slot = self.find(val)
+        if slot is None:
+            return False
+        self._remove_slot(slot)
+        return True
+
+    def remove_all(self, val: T) -> int:
+        """
+        Removes every occurrence of val
+        :param val: the value to be removed
+        :return: the number of values removed
+        """
+        found = self.find_all(val)
+        for slot in found:
+            self._remove_slot(slot)
+        return len(found)
+
+    def reverse(self) -> None:
+        """
+        Reverses the list in O(1) by swapping the next and prev slabs
+        :returns: None
+        """
+        self._next, self._prev = self._prev, self._next
+        self.head, self.tail = self.tail, self.head
+
+
+class NumericDLL:
+    """
+    Doubly linked list of numbers stored in NumPy arrays: values in one array of dtype, next/prev links in two
+    int arrays, with NIL as the null link. Like ArrayDLL, nodes are referred to by their int slot.
+    Searches and bulk removals compare the values in traversal order with one vectorized expression instead of
+    one Python == per node. Storage loaded by list_to_dll and grown only by push at the back stays in traversal
+    order, so no walk is needed to find that order; after other changes it is walked once and cached.
+    remove_all and remove_many compact the storage, which invalidates slots handed out before them.
+    Values the dtype cannot hold, such as 2.7 in an int list or an out-of-range number, are rejected rather than
+    truncated or wrapped; only float rounding is allowed. Requires numpy.
+    """
+    __slots__ = ["head", "tail", "size", "_values", "_next", "_prev", "_free", "_used", "_ordered", "_order"]
+
+    def __init__(self, dtype=None, links=None, capacity: int = 16) -> None:
+        """
+        Construct an empty numeric doubly linked list.
+
+        :param dtype: NumPy dtype of the values; defaults to int64.
+        :param links: NumPy integer dtype of the links, int32 or int64 (the default); int32 halves their memory
+            for lists of under 2**31 slots.
+        :param capacity: number of slots allocated up front; the arrays double when full.
+        :return: None.
+        """
+        if np is None:
+            raise ImportError("NumericDLL requires numpy")
+        self._values = np.empty(capacity, np.int64 if dtype is None else dtype)
+        self._next = np.full(capacity, NIL, np.int64 if links is None else links)
+        self._prev = np.full(capacity, NIL, self._next.dtype)
+        self._clear()
+
+    def _clear(self) -> None:
+        """
+        Empties the list, keeping the arrays
+        :returns: None
+        """
+        self.head = self.tail = NIL
+        self.size = 0
+        self._free = []
+        self._used = 0  # slots below this have been handed out
+        self._ordered = True  # slots 0 .. size - 1 are the list in traversal order
+        self._order = None  # cached traversal order when not _ordered
+
+    def __repr__(self) -> str:
+        """
+        Represent the NumericDLL as a string, in the same format as DLL.
+
+        :return: string representation of the NumericDLL, truncated like that of a DLL.
+        """
+        return _bounded_repr((f"Node({self._values[slot]})" for slot in self._slots()),
+                             (f"Node({self._values[slot]})" for slot in self._slots(reverse=True)), self.size)
+
+    def _slots(self, reverse: bool = False) -> Iterator[int]:
+        """
+        Lazily walks the links one slot at a time, for callers that only look at a few slots from either end
+        :param reverse: boolean indicating walking from head via next (False) or from tail via prev (True)
+        :return: iterator over the slots in list order
+        """
+        links = self._prev if reverse else self._next
+        slot = self.tail if reverse else self.head
+        while slot != NIL:
+            yield slot
+            slot = links[slot]
+
+    __str__ = __repr__
+
+    def __eq__(self, other: "NumericDLL") -> bool:
+        """
+        :param other: compares equality with this List
+        :return: True if both lists hold equal values in the same order, otherwise False
+        """
+        return self.size == other.size and bool(np.array_equal(self.to_numpy(), other.to_numpy()))
+
+    def __len__(self) -> int:
+        """
+        :return: number of values in the list
+        """
+        return self.size
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterates over a snapshot of the values taken in one vectorized pass
+        :return: iterator over the values of the list, head to tail, as Python numbers
+        """
+        return iter(self.dll_to_list())
+
+    def value(self, slot: int) -> T:
+        """
+        Returns the value stored in a live slot
+        :param slot: slot returned by find or find_all
+        :return: the value held by that slot, as a Python number
+        """
+        return self._values[slot].item()
+
+    def empty(self) -> bool:
+        """
+        :return: True if the list holds no values, False otherwise
+        """
+        return self.head == NIL
+
+    def _grow(self, capacity: int) -> None:
+        """
+        Reallocates the arrays with room for capacity slots, keeping their contents
+        :param capacity: new number of slots
+        :returns: None
+        """
+        for name in ("_values", "_next", "_prev"):
+            old = getattr(self, name)
+            new = np.empty(capacity, old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _checked(self, values):
+        """
+        Converts values to the list's dtype, refusing a conversion that would lose more than float rounding
+        :param values: a number, or a sequence or NumPy array of numbers
+        :return: NumPy array of the converted values
+        :raises ValueError: if a value changes kind or range on the way, e.g. 2.7 or nan in an int64 list, 300 in
+            an int8 one, or 1e40 (which would become inf) in a float32 one
+        """
+        values = np.asarray(values)
+        dtype = self._values.dtype
+        try:
+            with np.errstate(invalid="ignore", over="ignore"):  # a failed conversion is reported below
+                if dtype.kind in "fc":  # rounding to a float dtype is fine, changing kind or overflowing to inf is not
+                    exact = np.can_cast(values.dtype, dtype, "same_kind")
+                    if exact:
+                        cast = values.astype(dtype)
+                        exact = np.array_equal(np.isfinite(cast), np.isfinite(values))
+                else:
+                    cast = values.astype(dtype)
+                    exact = np.array_equal(cast, values) and np.array_equal(cast.astype(values.dtype), values)
+        except (OverflowError, ValueError, TypeError):
+            exact = False
+        if not exact:
+            raise ValueError(f"values do not fit the list's dtype {dtype} without loss")
+        return cast
+
+    def _alloc(self, val: T) -> int:
+        """
+        Takes a slot from the free list, or the next unused one, growing the arrays when full, and stores val in it
+        :param val: value to be stored
+        :return: the allocated slot
+        """
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = self._used
+            if slot == len(self._values):
+                self._grow(max(2 * slot, 16))
+            self._used += 1
+        self._values[slot] = val
+        return slot
+
+    def push(self, val: T, back: bool = True) -> None:
+        """
+        Adds val to the back or front of the list
+        :param val: value to be added; converted to the list's dtype
+        :param back: boolean indicating adding to front (False) or back (True)
+        :returns: None
+        :raises ValueError: if the conversion would lose more than float rounding
+        """
+        try:
+            cast = self._values.dtype.type(val)
+            exact = cast.item() == val
+        except (OverflowError, ValueError, TypeError):
+            exact = False
+        slot = self._alloc(cast if exact else self._checked(val))  # only inexact values take the full check
+        self._ordered = self._ordered and back and slot == self.size
+        self._order = None
+        nxt, prv = self._next, self._prev
+        if self.head == NIL:
+            nxt[slot] = prv[slot] = NIL
+            self.head = self.tail = slot
+        elif back:
+            nxt[slot] = NIL
+            prv[slot] = self.tail
+            nxt[self.tail] = slot
+            self.tail = slot
+        else:
+            prv[slot] = NIL
+            nxt[slot] = self.head
+            prv[self.head] = slot
+            self.head = slot
+        self.size += 1
+
+    def pop(self, back: bool = True) -> None:
+        """
+        Removes the last or first value of the list; does nothing on an empty list
+        :param back: boolean indicating removal from front (False) or back (True)
+        :returns: None
+        """
+        if self.head != NIL:
+            self._remove_slot(self.tail if back else self.head)
+
+    def _load(self, values) -> None:
+        """
+        Replaces the contents with values, laid out in traversal order
+        :param values: one-dimensional array of values, in order
+        :returns: None
+        """
+        n = len(values)
+        capacity = max(n, 16)
+        self._values = np.empty(capacity, self._values.dtype)
+        self._values[:n] = values
+        self._next = np.full(capacity, NIL, self._next.dtype)
+        self._prev = np.full(capacity, NIL, self._next.dtype)
+        self._clear()
+        if n:
+            self._next[:n - 1] = np.arange(1, n)
+            self._prev[1:n] = np.arange(n - 1)
+            self.head, self.tail = 0, n - 1
+            self.size = self._used = n
+
+    def list_to_dll(self, source: List[T]) -> None:
+        """
+        Replaces the contents of the list with the values of source, in one vectorized pass
+        :param source: python list, NumPy array or other sequence of numbers, in order
+        :returns: None
+        :raises ValueError: if converting a value to the list's dtype would lose more than float rounding
+        """
+        self._load(self._checked(source).ravel())
+
+    def _traversal(self):
+        """
+        :return: int array of the live slots, head to tail; free when the storage is in order, else walked once
+            in Python and cached until the next change
+        """
+        if self._ordered:
+            return np.arange(self.size, dtype=self._next.dtype)
+        if self._order is None:
+            nxt = self._next.tolist()
+            order = [NIL] * self.size
+            slot = self.head
+            for i in range(self.size):
+                order[i] = slot
+                slot = nxt[slot]
+            self._order = np.array(order, self._next.dtype)
+        return self._order
+
+    def to_numpy(self):
+        """
+        Counterpart of dll_to_list returning a new NumPy array, without converting values to Python objects
+        :return: array of the values, head to tail
+        """
+        if self._ordered:
+            return self._values[:self.size].copy()
+        return self._values[self._traversal()]
+
+    def dll_to_list(self) -> List[T]:
+        """
+        :return: python list of the values, head to tail
+        """
+        return self.to_numpy().tolist()
+
+    def _matches(self, mask) -> List[int]:
+        """
+        :param mask: boolean array over the values in traversal order
+        :return: list of the slots where mask is True, head to tail
+        """
+        return self._traversal()[mask].tolist()
+
+    def find(self, val: T) -> int:
+        """
+        :param val: the value to be found
+        :returns: slot of the first occurrence of val, or None
+        """
+        hits = np.flatnonzero(self.to_numpy() == val)
+        return int(self._traversal()[hits[0]]) if len(hits) else None
+
+    def find_all(self, val: T) -> List[int]:
+        """
+        :param val: the value to be found
+        :return: list of the slots holding val, head to tail
+        """
+        return self._matches(self.to_numpy() == val)
+
+    def _remove_slot(self, slot: int) -> None:
+        """
+        Unlinks a live slot and frees it; removing the tail of in-order storage keeps it in order
+        :param slot: the slot to be removed
+        :returns: None
+        """
+        nxt, prv = self._next, self._prev
+        before, after = int(prv[slot]), int(nxt[slot])
+        if before == NIL:
+            self.head = after
+        else:
+            nxt[before] = after
+        if after == NIL:
+            self.tail = before
+        else:
+            prv[after] = before
+        self.size -= 1
+        self._order = None
+        if self._ordered and slot == self._used - 1:
+            self._used -= 1
+        else:
+            self._ordered = False
+            self._free.append(slot)
+
+    def remove(self, val: T) -> bool:
+        """
+        Removes the first occurrence of val
+        :param val: the value to be removed
+        :return: True if a value was removed, False otherwise
+        """
+        slot = self.find(val)
+        if slot is None:
+            return False
+        self._remove_slot(slot)
+        return True
+
+    def _keep(self, mask) -> int:
+        """
+        Keeps only the values where mask is True, compacting the storage into traversal order
+        :param mask: boolean array over the values in traversal order
+        :return: the number of values removed
+        """
+        values = self.to_numpy()
+        kept = values[mask]
+        removed = len(values) - len(kept)
+        if removed:
+            self._load(kept)
+        return removed
+
+    def remove_all(self, val: T) -> int:
+        """
+        Removes every occurrence of val with one vectorized comparison
+        :param val: the value to be removed
+        :return: the number of values removed
+        """
+        return self._keep(self.to_numpy() != val)
+
+    def remove_many(self, values: Iterable[T]) -> int:
+        """
+        Removes every occurrence of any of values with one vectorized membership test
+        :param values: the values to be removed
+        :return: the number of values removed
+        """
+        return self._keep(~np.isin(self.to_numpy(), np.asarray(list(values))))
+
+    def reverse(self) -> None:
+        """
+        Reverses the list in O(1) by swapping the next and prev arrays
+        :returns: None
+        """
+        self._next, self._prev = self._prev, self._next
+        self.head, self.tail = self.tail, self.head
+        if self.size > 1:
+            self._ordered = False
+        self._order = None
+
+
+class _Block:
+    """
+    Link of an UnrolledDLL holding up to capacity values in a Python list.
+    """
+    __slots__ = ["values", "next", "prev"]
+
+    def __init__(self, values: List[T], next: "_Block" = None, prev: "_Block" = None) -> None:
+        """
+        Construct a block.
+
+        :param values: values held by the block, in order.
+        :param next: reference to the next block.
+        :param prev: reference to the previous block.
+        :return: None.
+        """
+        self.values = values
+        self.next = next
+        self.prev = prev
+
+
+class UnrolledDLL:
+    """
+    Unrolled doubly linked list: each link holds a small block of values, so traversal touches one
+    link per block rather than one Node per value. Blocks split when an insert overflows them and
+    merge with a neighbour when removals leave them under half full. Positions stand in for Nodes.
+    """
+    __slots__ = ["head", "tail", "size", "capacity"]
+
+    def __init__(self, capacity: int = 64) -> None:
+        """
+        Construct an empty unrolled doubly linked list.
+
+        :param capacity: maximum number of values per block, at least 2.
+        :return: None.
+        """
+        self.head = self.tail = None
+        self.size = 0
+        self.capacity = max(capacity, 2)
+
+    def __repr__(self) -> str:
+        """
+        Represent the UnrolledDLL as a string, in the same format as DLL.
+
+        :return: string representation of the UnrolledDLL, truncated like that of a DLL.
+        """
+        return _bounded_repr((f"Node({str(val)})" for val in self), (f"Node({str(val)})" for val in reversed(self)),
+                             self.size)
+
+    __str__ = __repr__
+
+    def __eq__(self, other: "UnrolledDLL") -> bool:
+        """
+        :param other: compares equality with this List
+        :return: True if both lists hold equal values in the same order, otherwise False
+        """
+        if self.size != other.size:
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+    def __len__(self) -> int:
+        """
+        :return: number of values in the list
+        """
+        return self.size
+
+    def _blocks(self) -> Iterator[_Block]:
+        """
+        :return: iterator over the blocks, head to tail
+        """
+        block = self.head
+        while block is not None:
+            yield block
+            block = block.next
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        :return: iterator over the values, head to tail
+        """
+        return chain.from_iterable(block.values for block in self._blocks())
+
+    def __reversed__(self) -> Iterator[T]:
+        """
+        :return: iterator over the values, tail to head
+        """
+        block = self.tail
+        while block is not None:
+            yield from reversed(block.values)
+            block = block.prev
+
+    def _link_block(self, block: _Block, after: _Block) -> None:
+        """
+        Links a detached block after another, or at the front when after is None
+        :param block: the block to be linked
+        :param after: the block to link after, or None
+        :returns: None
+        """
+        block.prev = after
+        block.next = self.head if after is None else after.next
+        if block.next is None:
+            self.tail = block
+        else:
+            block.next.prev = block
+        if after is None:
+            self.head = block
+        else:
+            after.next = block
+
+    def _unlink_block(self, block: _Block) -> None:
+        """
+        Unlinks a block from the list
+        :param block: the block to be unlinked
+        :returns: None
+        """
+        if block.prev is None:
+            self.head = block.next
+        else:
+            block.prev.next = block.next
+        if block.next is None:
+            self.tail = block.prev
+        else:
+            block.next.prev = block.prev
+
+    def _rebalance(self, block: _Block) -> None:
+        """
+        Drops a block left empty, or merges an under-full block with its successor when both fit in one
+        :param block: a block that just lost values
+        :returns: None
+        """
+        if not block.values:
+            self._unlink_block(block)
+        elif len(block.values) < self.capacity // 2 and block.next is not None \
+                and len(block.values) + len(block.next.values) <= self.capacity:
+            block.values.extend(block.next.values)
+            self._unlink_block(block.next)
+
+    def empty(self) -> bool:
+        """
+        :return: True if the list holds no values, False otherwise
+        """
+        return self.head is None
+
+    def push(self, val: T, back: bool = True) -> None:
+        """
+        Adds val to the back or front of the list, opening a new block when the end block is full
+        :param val: value to be added
+        :param back: boolean indicating adding to front (False) or back (True)
+        :returns: None
+        """
+        if back:
+            if self.tail is None or len(self.tail.values) >= self.capacity:
+                self._link_block(_Block([]), self.tail)
+            self.tail.values.append(val)
+        else:
+            if self.head is None or len(self.head.values) >= self.capacity:
+                self._link_block(_Block([]), None)
+            self.head.values.insert(0, val)
+        self.size += 1
+
+    def pop(self, back: bool = True) -> None:
+        """
+        Removes the last or first value of the list; does nothing on an empty list
+        :param back: boolean indicating removal from front (False) or back (True)
+        :returns: None
+        """
+        if self.head is None:
+            return
+        block = self.tail if back else self.head
+        block.values.pop(-1 if back else 0)
+        if not block.values:
+            self._unlink_block(block)
+        self.size -= 1
+
+    def insert(self, i: int, val: T) -> None:
+        """
+        Adds val so that it ends up at position i, like list.insert; a full block is split in half
+        :param i: position of the new value, clamped to the ends of the list
+        :param val: value to be added
+        :returns: None
+        """
+        if i < 0:
+            i = max(i + self.size, 0)
+        if i >= self.size:
+            return self.push(val)
+        block, offset = self._locate(i)
+        block.values.insert(offset, val)
+        if len(block.values) > self.capacity:
+            half = len(block.values) // 2
+            self._link_block(_Block(block.values[half:]), block)
+            del block.values[half:]
+        self.size += 1
+
+    def _locate(self, i: int) -> Tuple[_Block, int]:
+        """
+        :param i: 0-based position, assumed in range
+        :returns: tuple of the block holding position i and the offset within it
+        """
+        block = self.head
+        while i >= len(block.values):
+            i -= len(block.values)
+            block = block.next
+        return block, i
+
+    def list_to_dll(self, source: List[T]) -> None:
+        """
+        Replaces the contents of the list with the values of source, packed into full blocks
+        :param source: python list (or any iterable) of values
+        :returns: None
+        """
+        self.head = self.tail = None
+        self.size = 0
+        self.extend(source)
+
+    def extend(self, source: Iterable[T]) -> None:
+        """
+        Adds the values of source to the back of the list, in order, filling the tail block and then
+        linking full blocks
+        :param source: iterable of values to be added
+        :returns: None
+        """
+        values = iter(source)
+        if self.tail is not None and len(self.tail.values) < self.capacity:
+            chunk = list(islice(values, self.capacity - len(self.tail.values)))
+            self.tail.values.extend(chunk)
+            self.size += len(chunk)
+        while True:
+            chunk = list(islice(values, self.capacity))
+            if not chunk:
+                break
+            self._link_block(_Block(chunk), self.tail)
+            self.size += len(chunk)
+
+    def dll_to_list(self) -> List[T]:
+        """
+        :return: python list of the values, head to tail
+        """
+        result = []
+        for block in self._blocks():
+            result.extend(block.values)
+        return result
+
+    def _find_positions(self, val: T, find_first: bool = False) -> List[int]:
+        """
+        Collects the positions holding val, head to tail
+        :param val: the value to be found
+        :param find_first: boolean indicating to stop at the first match (True) or find all (False)
+        :returns: a list of matching positions, possibly empty
+        """
+        found = []
+        base = 0
+        for block in self._blocks():
+            values = block.values
+            if val in values:
+                for offset, other in enumerate(values):
+                    if other == val:
+                        found.append(base + offset)
+                        if find_first:
+                            return found
+            base += len(values)
+        return found
+
+    def find(self, val: T) -> int:
+        """
+        :param val: the value to be found
+        :returns: position of the first occurrence of val, or None
+        """
+        found = self._find_positions(val, True)
+        return found[0] if found else None
+
+    def find_all(self, val: T) -> List[int]:
+        """
+        :param val: the value to be found
+        :return: list of the positions holding val, head to tail
+        """
+        return self._find_positions(val)
+
+    def remove(self, val: T) -> bool:
+        """
+        Removes the first occurrence of val
+        :param val: the value to be removed
+        :return: True if a value was removed, False otherwise
+        """
+        for block in self._blocks():
+            if val in block.values:
+                block.values.remove(val)
+                self.size -= 1
+                self._rebalance(block)
+                return True
+        return False
+
+    def remove_if(self, predicate: Callable[[T], bool]) -> int:
+        """
+        Removes every value satisfying predicate in one traversal, then merges under-full blocks
+        :param predicate: function called once per value, head to tail; truthy results are removed
+        :return: the number of values removed
+        """
+        count = 0
+        for block in list(self._blocks()):
+            kept = [val for val in block.values if not predicate(val)]
+            if len(kept) != len(block.values):
+                count += len(block.values) - len(kept)
+                block.values = kept
+                if not kept:
+                    self._unlink_block(block)
+        if count:
+            self.size -= count
+            self._compact()
+        return count
+
+    def remove_many(self, values: Iterable[T]) -> int:
+        """
+        Removes every occurrence of any of values in one traversal
+        :param values: the values to be removed; unhashable values are compared one by one
+        :return: the number of values removed
+        """
+        return self.remove_if(_value_matcher(values)[1])
+
+    def remove_all(self, val: T) -> int:
+        """
+        Removes every occurrence of val
+        :param val: the value to be removed
+        :return: the number of values removed
+        """
+        count = 0
+        for block in list(self._blocks()):
+            if val in block.values:
+                kept = [other for other in block.values if other != val]
+                count += len(block.values) - len(kept)
+                block.values = kept
+                if not kept:
+                    self._unlink_block(block)
+        if count:
+            self.size -= count
+            self._compact()
+        return count
+
+    def _compact(self) -> None:
+        """
+        Merges each under-full block with its successor while both fit in one block
+        :returns: None
+        """
+        block = self.head
+        while block is not None:
+            if block.next is not None and len(block.values) < self.capacity // 2 \
+                    and len(block.values) + len(block.next.values) <= self.capacity:
+                block.values.extend(block.next.values)
+                self._unlink_block(block.next)
+            else:
+                block = block.next
+
+    def reverse(self) -> None:
+        """
+        Reverses the list in place by relinking blocks and reversing each block
+        :returns: None
+        """
+        block = self.head
+        while block is not None:
+            block.values.reverse()
+            block.next, block.prev = block.prev, block.next
+            block = block.prev
+        self.head, self.tail = self.tail, self.head
+
+
+class ConcurrentDLL:
+    """
+    Thread-safe doubly linked list shared by producer and consumer threads.
+    Uses the two-lock queue scheme: a dummy Node sits before the first value, so pushes at the back
+    (tail lock) and pops at the front (head lock) never write the same Node field and run in parallel.
+    Pushes at the front and pops at the back take both locks, always head lock first.
+    """
+    __slots__ = ["_dummy", "_tail", "_head_lock", "_tail_lock", "_not_empty", "_waiters", "_pushed", "_popped"]
+
+    def __init__(self) -> None:
+        """
+        Construct an empty concurrent doubly linked list.
+
+        :return: None.
+        """
+        self._dummy = self._tail = Node(None)
+        self._head_lock, self._tail_lock = Lock(), Lock()
+        self._not_empty = Condition(self._head_lock)
+        self._waiters = 0
+        self._pushed = 0  # written under the tail lock
+        self._popped = 0  # written under the head lock
+
+    def __repr__(self) -> str:
+        """
+        Represent a snapshot of the ConcurrentDLL as a string, in the same format as DLL.
+
+        :return: string representation of the ConcurrentDLL, truncated like that of a DLL; taken while holding
+            both locks.
+        """
+        def walk(node, back):
+            while node is not None and node is not self._dummy:
+                yield f"Node({str(node.value)})"
+                node = node.prev if back else node.next
+
+        with self._head_lock, self._tail_lock:
+            return _bounded_repr(walk(self._dummy.next, False), walk(self._tail, True), len(self))
+
+    __str__ = __repr__
+
+    def __len__(self) -> int:
+        """
+        :return: number of values in the list at the time of the call
+        """
+        return self._pushed - self._popped
+
+    def empty(self) -> bool:
+        """
+        :return: True if the list held no values at the time of the call, False otherwise
+        """
+        return self._dummy.next is None
+
+    def push(self, val: T, back: bool = True) -> None:
+        """
+        Adds val to the back (tail lock only) or front (both locks) of the list and wakes one waiting pop
+        :param val: value to be added
+        :param back: boolean indicating adding to front (False) or back (True)
+        :returns: None
+        """
+        node = Node(val)
+        if back:
+            with self._tail_lock:
+                node.prev = self._tail  # set before the node becomes reachable from the front
+                self._tail.next = node
+                self._tail = node
+                self._pushed += 1
+            if self._waiters:
+                with self._head_lock:
+                    self._not_empty.notify()
+        else:
+            with self._head_lock, self._tail_lock:
+                first = self._dummy.next
+                node.prev, node.next = self._dummy, first
+                if first is None:
+                    self._tail = node
+                else:
+                    first.prev = node
+                self._dummy.next = node
+                self._pushed += 1
+                self._not_empty.notify()
+
+    def pop(self, back: bool = True, timeout: float = 0) -> T:
+        """
+        Removes and returns the last or first value of the list, waiting for one if the list is empty
+        :param back: boolean indicating removal from front (False, head lock only) or back (True, both locks)
+        :param timeout: seconds to wait for a value; 0 does not wait and None waits indefinitely
+        :returns: the removed value, or None if the list stayed empty
+        """
+        with self._head_lock:
+            if self._dummy.next is None and timeout != 0:
+                deadline = None if timeout is None else monotonic() + timeout
+                self._waiters += 1
+                try:
+                    while self._dummy.next is None:
+                        if deadline is None:
+                            self._not_empty.wait()
+                        else:
+                            remaining = deadline - monotonic()
+                            if remaining <= 0:
+                                break
+                            self._not_empty.wait(remaining)
+                finally:
+                    self._waiters -= 1
+            if self._dummy.next is None:
+                return None
+
+            if back:
+                with self._tail_lock:
+                    last = self._tail
+                    self._tail = last.prev
+                    self._tail.next = None
+                    last.prev = None
+                    self._popped += 1
+                    return last.value
+
+            old, first = self._dummy, self._dummy.next
+            val = first.value
+            first.value = first.prev = None  # first becomes the new dummy
+            old.next = None
+            self._dummy = first
+            self._popped += 1
+            return val
+
+    def dll_to_list(self) -> List[T]:
+        """
+        :return: python list of the values, head to tail, taken while holding both locks
+        """
+        with self._head_lock, self._tail_lock:
+            result = []
+            node = self._dummy.next
+            while node is not None:
+                result.append(node.value)
+                node = node.next
+            return result
+
+
+class AsyncDLL:
+    """
+    asyncio wrapper around a DLL: pop waits until a value is available and, when maxsize is set, push
+    waits for room. Waiters are futures woken one at a time, in the manner of asyncio.Queue, and a
+    cancelled waiter hands its wakeup on so none is lost.
+    """
+    __slots__ = ["maxsize", "_dll", "_getters", "_putters", "_closed"]
+
+    def __init__(self, maxsize: int = 0, dll: DLL = None) -> None:
+        """
+        Construct an AsyncDLL.
+
+        :param maxsize: maximum number of values before push waits; 0 for no bound.
+        :param dll: DLL to wrap; a new empty DLL by default.
+        :return: None.
+        """
+        self.maxsize = maxsize
+        self._dll = DLL() if dll is None else dll
+        self._getters = deque()
+        self._putters = deque()
+        self._closed = False
+
+    def __repr__(self) -> str:
+        """
+        Represent the wrapped DLL as a string.
+
+        :return: string representation of the wrapped DLL.
+        """
+        return repr(self._dll)
+
+    def __len__(self) -> int:
+        """
+        :return: number of values in the list
+        """
+        return self._dll.size
+
+    def empty(self) -> bool:
+        """
+        :return: True if the list holds no values, False otherwise
+        """
+        return self._dll.empty()
+
+    def full(self) -> bool:
+        """
+        :return: True if push would have to wait for room, False otherwise
+        """
+        return 0 < self.maxsize <= self._dll.size
+
+    @staticmethod
+    def _wakeup_next(waiters: deque) -> None:
+        """
+        Wakes the oldest waiter that is still waiting
+        :param waiters: deque of waiter futures
+        :returns: None
+        """
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    async def _wait(self, waiters: deque, blocked: Callable[[], bool]) -> None:
+        """
+        Parks the calling task on waiters until blocked() turns False; on cancellation the waiter is
+        withdrawn and, if it had already been woken, the wakeup is passed to the next waiter
+        :param waiters: deque the waiter future joins
+        :param blocked: zero-argument callable telling whether the caller must keep waiting
+        :returns: None
+        """
+        while blocked():
+            waiter = asyncio.get_running_loop().create_future()
+            waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                try:
+                    waiters.remove(waiter)
+                except ValueError:
+                    pass
+                if not blocked() and not waiter.cancelled():
+                    self._wakeup_next(waiters)
+                raise
+
+    def push_nowait(self, val: T, back: bool = True) -> None:
+        """
+        Adds val to the back or front of the list without waiting
+        :param val: value to be added
+        :param back: boolean indicating adding to front (False) or back (True)
+        :returns: None
+        :raises asyncio.QueueFull: if the list is at maxsize
+        :raises RuntimeError: if the list has been closed
+        """
+        if self._closed:
+            raise RuntimeError("push to a closed AsyncDLL")
+        if self.full():
+            raise asyncio.QueueFull
+        self._dll.push(val, back)
+        self._wakeup_next(self._getters)
+
+    async def push(self, val: T, back: bool = True) -> None:
+        """
+        Adds val to the back or front of the list, first waiting for room if the list is at maxsize
+        :param val: value to be added
+        :param back: boolean indicating adding to front (False) or back (True)
+        :returns: None
+        :raises RuntimeError: if the list has been closed, including while waiting for room
+        """
+        await self._wait(self._putters, lambda: self.full() and not self._closed)
+        self.push_nowait(val, back)
+
+    def pop_nowait(self, back: bool = True) -> T:
+        """
+        Removes and returns the last or first value of the list without waiting
+        :param back: boolean indicating removal from front (False) or back (True)
+        :returns: the removed value
+        :raises asyncio.QueueEmpty: if the list is empty
+        """
+        if self._dll.empty():
+            raise asyncio.QueueEmpty
+        val = (self._dll.tail if back else self._dll.head).value
+        self._dll.pop(back)
+        self._wakeup_next(self._putters)
+        return val
+
+    async def pop(self, back: bool = True) -> T:
+        """
+        Removes and returns the last or first value of the list, first waiting until one is available
+        :param back: boolean indicating removal from front (False) or back (True)
+        :returns: the removed value
+        :raises asyncio.QueueEmpty: if the list is empty and has been closed
+        """
+        await self._wait(self._getters, lambda: self._dll.empty() and not self._closed)
+        return self.pop_nowait(back)
+
+    def close(self) -> None:
+        """
+        Refuses further pushes and wakes every waiting push and pop; waiting pushes raise RuntimeError, and
+        values already in the list can still be popped
+        :returns: None
+        """
+        self._closed = True
+        for waiters in (self._getters, self._putters):
+            while waiters:
+                self._wakeup_next(waiters)
+
+    def __aiter__(self) -> "AsyncDLL":
+        """
+        :return: self; async iteration pops values from the front until the list is closed and drained
+        """
+        return self
+
+    async def __anext__(self) -> T:
+        """
+        :return: the next value popped from the front
+        """
+        try:
+            return await self.pop(back=False)
+        except asyncio.QueueEmpty:
+            raise StopAsyncIteration
+
+
+class SharedDLL:
+    """
+    Doubly linked list of bytes values living in a multiprocessing.shared_memory segment, so worker
+    processes attached by name all see and mutate the same list without pickling it.
+    The segment holds a header, int64 next/prev/length slabs and fixed-size value slots; freed slots are
+    chained through the next slab. Every operation holds a cross-process lock shared by the workers.
+    """
+    __slots__ = ["lock", "_shm", "_header", "_next", "_prev", "_lengths", "_values", "capacity", "slot_size"]
+
+    _HEADER = 8  # int64 fields: capacity, slot_size, head, tail, size, free, unused, unused
+    _CAPACITY, _SLOT_SIZE, _HEAD, _TAIL, _SIZE, _FREE = range(6)
+
+    def __init__(self, shm: shared_memory.SharedMemory, lock) -> None:
+        """
+        Wrap an initialized segment; use SharedDLL.create or SharedDLL.attach instead.
+
+        :param shm: shared memory segment laid out by SharedDLL.create.
+        :param lock: cross-process lock guarding the segment, shared by every attached worker.
+        :return: None.
+        """
+        self._shm, self.lock = shm, lock
+        buf = shm.buf
+        self._header = buf[:self._HEADER * 8].cast("q")
+        self.capacity, self.slot_size = self._header[self._CAPACITY], self._header[self._SLOT_SIZE]
+        offset = self._HEADER * 8
+        slab = self.capacity * 8
+        self._next = buf[offset:offset + slab].cast("q")
+        self._prev = buf[offset + slab:offset + 2 * slab].cast("q")
+        self._lengths = buf[offset + 2 * slab:offset + 3 * slab].cast("q")
+        self._values = buf[offset + 3 * slab:offset + 3 * slab + self.capacity * self.slot_size]
+
+    @classmethod
+    def create(cls, capacity: int, slot_size: int = 64, name: str = None, lock=None) -> "SharedDLL":
+        """
+        Creates a new segment holding an empty list
+        :param capacity: maximum number of values the list can hold
+        :param slot_size: maximum length in bytes of each value
+        :param name: segment name, chosen by the system when None
+        :param lock: cross-process lock; a new multiprocessing.RLock when None
+        :returns: the new SharedDLL; pass its name and lock to workers
+        """
+        size = cls._HEADER * 8 + capacity * (24 + slot_size)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = shm.buf[:cls._HEADER * 8].cast("q")
+        header[cls._CAPACITY], header[cls._SLOT_SIZE] = capacity, slot_size
+        header[cls._HEAD] = header[cls._TAIL] = NIL
+        header[cls._SIZE] = 0
+        header[cls._FREE] = 0 if capacity else NIL
+        header.release()
+        dll = cls(shm, multiprocessing.RLock() if lock is None else lock)
+        for slot in range(capacity):
+            dll._next[slot] = slot + 1 if slot + 1 < capacity else NIL
+        return dll
+
+    @classmethod
+    def attach(cls, name: str, lock) -> "SharedDLL":
+        """
+        Attaches to a segment created by another process
+        :param name: name of the segment
+        :param lock: the lock of the creating SharedDLL
+        :returns: a SharedDLL over the same segment
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13 always tracks; workers started from the creator share its tracker
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, lock)
+
+    @property
+    def name(self) -> str:
+        """
+        :return: name of the shared memory segment, used by workers to attach
+        """
+        return self._shm.name
+
+    def close(self) -> None:
+        """
+        Detaches this process from the segment; the list is unusable afterwards
+        :returns: None
+        """
+        for view in (self._header, self._next, self._prev, self._lengths, self._values):
+            view.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """
+        Destroys the segment once every process has closed it; call from the creator
+        :returns: None
+        """
+        self._shm.unlink()
+
+    def __len__(self) -> int:
+        """
+        :return: number of values in the list
+        """
+        return self._header[self._SIZE]
+
+    def __repr__(self) -> str:
+        """
+        Represent the SharedDLL as a string, in the same format as DLL.
+
+        :return: string representation of the SharedDLL, truncated like that of a DLL.
+        """
+        with self.lock:
+            return _bounded_repr((f"Node({str(self.value(slot))})" for slot in self._slots()),
+                                 (f"Node({str(self.value(slot))})" for slot in self._slots(reverse=True)), len(self))
+
+    __str__ = __repr__
+
+    def empty(self) -> bool:
+        """
+        :return: True if the list holds no values, False otherwise
+        """
+        return self._header[self._HEAD] == NIL
+
+    def value(self, slot: int) -> bytes:
+        """
+        :param slot: slot returned by find or find_all
+        :return: copy of the bytes stored in that slot
+        """
+        start = slot * self.slot_size
+        return bytes(self._values[start:start + self._lengths[slot]])
+
+    def push(self, val: bytes, back: bool = True) -> None:
+        """
+        Copies val into a free slot and links it at the back or front of the list
+        :param val: bytes-like value of at most slot_size bytes
+        :param back: boolean indicating adding to front (False) or back (True)
+        :returns: None
+        :raises ValueError: if val is longer than slot_size
+        :raises MemoryError: if all capacity slots are in use
+        """
+        val = memoryview(val).cast("B")
+        if len(val) > self.slot_size:
+            raise ValueError(f"value of {len(val)} bytes exceeds slot_size {self.slot_size}")
+        header, nxt, prv = self._header, self._next, self._prev
+        with self.lock:
+            slot = header[self._FREE]
+            if slot == NIL:
+                raise MemoryError("SharedDLL capacity exhausted")
+            header[self._FREE] = nxt[slot]
+            start = slot * self.slot_size
+            self._values[start:start + len(val)] = val
+            self._lengths[slot] = len(val)
+            if header[self._HEAD] == NIL:
+                nxt[slot] = prv[slot] = NIL
+                header[self._HEAD] = header[self._TAIL] = slot
+            elif back:
+                nxt[slot], prv[slot] = NIL, header[self._TAIL]
+                nxt[header[self._TAIL]] = slot
+                header[self._TAIL] = slot
+            else:
+                nxt[slot], prv[slot] = header[self._HEAD], NIL
+                prv[header[self._HEAD]] = slot
+                header[self._HEAD] = slot
+            header[self._SIZE] += 1
+
+    def _remove_slot(self, slot: int) -> None:
+        """
+        Unlinks a live slot and chains it onto the free list; the caller holds the lock
+        :param slot: the slot to be removed
+        :returns: None
+        """
+        header, nxt, prv = self._header, self._next, self._prev
+        before, after = prv[slot], nxt[slot]
+        if before == NIL:
+            header[self._HEAD] = after
+        else:
+            nxt[before] = after
+        if after == NIL:
+            header[self._TAIL] = before
+        else:
+            prv[after] = before
+        nxt[slot] = header[self._FREE]
+        header[self._FREE] = slot
+        header[self._SIZE] -= 1
+
+    def pop(self, back: bool = True) -> bytes:
+        """
+        Removes the last or first value of the list
+        :param back: boolean indicating removal from front (False) or back (True)
+        :returns: the removed bytes, or None if the list is empty
+        """
+        with self.lock:
+            slot = self._header[self._TAIL if back else self._HEAD]
+            if slot == NIL:
+                return None
+            val = self.value(slot)
+            self._remove_slot(slot)
+            return val
+
+    def _slots(self, reverse: bool = False) -> Iterator[int]:
+        """
+        :param reverse: boolean indicating walking from head via next (False) or from tail via prev (True)
+        :return: iterator over the live slots in list order; the caller holds the lock
+        """
+        links = self._prev if reverse else self._next
+        slot = self._header[self._TAIL if reverse else self._HEAD]
+        while slot != NIL:
+            yield slot
+            slot = links[slot]
+
+    def _matching_slots(self, val: bytes) -> Iterator[int]:
+        """
+        :param val: bytes-like value to be found
+        :return: iterator over the live slots holding val, head to tail; the caller holds the lock
+        """
+        val = bytes(val)
+        size, lengths, values = self.slot_size, self._lengths, self._values
+        for slot in self._slots():
+            if lengths[slot] == len(val) and values[slot * size:slot * size + len(val)] == val:
+                yield slot
+
+    def find_all(self, val: bytes) -> List[int]:
+        """
+        :param val: bytes-like value to be found
+        :return: list of the slots holding val, head to tail
+        """
+        with self.lock:
+            return list(self._matching_slots(val))
+
+    def find(self, val: bytes) -> int:
+        """
+        :param val: bytes-like value to be found
+        :returns: slot of the first occurrence of val, or None
+        """
+        with self.lock:
+            return next(self._matching_slots(val), None)
+
+    def remove(self, val: bytes) -> bool:
+        """
+        Removes the first occurrence of val
+        :param val: bytes-like value to be removed
+        :return: True if a value was removed, False otherwise
+        """
+        with self.lock:
+            slot = next(self._matching_slots(val), None)
+            if slot is None:
+                return False
+            self._remove_slot(slot)
+            return True
+
+    def __iter__(self) -> Iterator[bytes]:
+        """
+        Iterates over a snapshot of the values, so a partly consumed iterator never keeps the lock from the
+        other workers
+        :return: iterator over copies of the values, head to tail
+        """
+        return iter(self.dll_to_list())
+
+    def dll_to_list(self) -> List[bytes]:
+        """
+        :return: python list of copies of the values, head to tail, taken while holding the lock
+        """
+        with self.lock:
+            return [self.value(slot) for slot in self._slots()]
+
+
+class MappedDLL:
+    """
+    Read-only doubly linked list opened from a file written by MappedDLL.save, through mmap.
+    Opening reads only the header; links, payload offsets and values stay in the mapped file and pages
+    load lazily as traversal, find and dll_to_list touch them. Nodes are referred to by their int slot.
+
+    File layout: magic, then 8 int64 header fields (slot count, head, tail, size and the file offsets of
+    the next, prev and payload-offset slabs), then the pickled values back to back, padded to 8 bytes,
+    then the int64 next, prev and payload-offset slabs (slot count + 1 offsets).
+
+    Values are decoded with pickle, which can run arbitrary code: only open files from a trusted source.
+    """
+    __slots__ = ["head", "tail", "size", "_file", "_map", "_next", "_prev", "_offsets"]
+
+    MAGIC = b"DLLMAP01"
+    _HEADER = struct.Struct("<8q")
+
+    def __init__(self, path: str) -> None:
+        """
+        Map a saved list in O(1); use as a context manager or call close when done. The file must come
+        from a trusted source, since values are unpickled.
+
+        :param path: file written by MappedDLL.save.
+        :return: None.
+        """
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # an empty file cannot be mapped
+            self._file.close()
+            raise ValueError(f"{path} is not a MappedDLL file")
+        if self._map[:len(self.MAGIC)] != self.MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a MappedDLL file")
+        try:
+            count, self.head, self.tail, self.size, next_at, prev_at, offsets_at, _ = \
+                self._HEADER.unpack_from(self._map, len(self.MAGIC))
+        except struct.error:  # truncated header
+            self.close()
+            raise ValueError(f"{path} is not a MappedDLL file")
+        view = memoryview(self._map)
+        self._next = view[next_at:next_at + 8 * count].cast("q")
+        self._prev = view[prev_at:prev_at + 8 * count].cast("q")
+        self._offsets = view[offsets_at:offsets_at + 8 * (count + 1)].cast("q")
+        view.release()
+
+    @classmethod
+    def save(cls, source: Iterable[T], path: str) -> None:
+        """
+        Writes the values of source, in order, to path in one streaming pass
+        :param source: iterable of picklable values, such as a DLL
+        :param path: file to be written
+        :returns: None
+        """
+        with open(path, "wb") as file:
+            file.write(cls.MAGIC + cls._HEADER.pack(*[0] * 8))
+            offsets = array("q")
+            position = file.tell()
+            for val in source:
+                offsets.append(position)
+                position += file.write(pickle.dumps(val, pickle.HIGHEST_PROTOCOL))
+            offsets.append(position)
+            position += file.write(bytes(-position % 8))
+
+            count = len(offsets) - 1
+            next_at = position
+            file.write(array("q", range(1, count)).tobytes() + array("q", [NIL] * min(count, 1)).tobytes())
+            prev_at = next_at + 8 * count
+            file.write(array("q", [NIL] * min(count, 1)).tobytes() + array("q", range(count - 1)).tobytes())
+            offsets_at = prev_at + 8 * count
+            file.write(offsets.tobytes())
+
+            head = 0 if count else NIL
+            file.seek(len(cls.MAGIC))
+            file.write(cls._HEADER.pack(count, head, count - 1 if count else NIL, count,
+                                        next_at, prev_at, offsets_at, 0))
+
+    def close(self) -> None:
+        """
+        Releases the mapping and the file
+        :returns: None
+        """
+        for name in ("_next", "_prev", "_offsets"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedDLL":
+        """
+        :return: self
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Closes the mapping on leaving the with block
+        :returns: None
+        """
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        :return: number of values in the list
+        """
+        return self.size
+
+    def __repr__(self) -> str:
+        """
+        Represent the MappedDLL as a string, in the same format as DLL.
+
+        :return: string representation of the MappedDLL, truncated like that of a DLL.
+        """
+        return _bounded_repr((f"Node({str(val)})" for val in self), (f"Node({str(val)})" for val in reversed(self)),
+                             self.size)
+
+    __str__ = __repr__
+
+    def empty(self) -> bool:
+        """
+        :return: True if the list holds no values, False otherwise
+        """
+        return self.head == NIL
+
+    def value(self, slot: int) -> T:
+        """
+        Decodes the value of one slot straight from the mapped payload
+        :param slot: slot returned by find or find_all
+        :return: the value held by that slot
+        """
+        return pickle.loads(self._map[self._offsets[slot]:self._offsets[slot + 1]])
+
+    def _slots(self, reverse: bool = False) -> Iterator[int]:
+        """
+        :param reverse: boolean indicating walking from head via next (False) or from tail via prev (True)
+        :return: iterator over the slots in list order
+        """
+        links = self._prev if reverse else self._next
+        slot = self.tail if reverse else self.head
+        while slot != NIL:
+            yield slot
+            slot = links[slot]
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        :return: iterator over the values, head to tail
+        """
+        return map(self.value, self._slots())
+
+    def __reversed__(self) -> Iterator[T]:
+        """
+        :return: iterator over the values, tail to head
+        """
+        return map(self.value, self._slots(reverse=True))
+
+    def dll_to_list(self) -> List[T]:
+        """
+        :return: python list of the values, head to tail
+        """
+        return list(self)
+
+    def find_all(self, val: T) -> List[int]:
+        """
+        :param val: the value to be found
+        :return: list of the slots holding val, head to tail
+        """
+        return [slot for slot in self._slots() if self.value(slot) == val]
+
+    def find(self, val: T) -> int:
+        """
+        :param val: the value to be found
+        :returns: slot of the first occurrence of val, or None
+        """
+        return next((slot for slot in self._slots() if self.value(slot) == val), None)
+
+    def to_dll(self, **options) -> DLL:
+        """
+        Materializes the mapped list as an in-memory DLL
+        :param options: keyword arguments passed to the DLL constructor
+        :return: a new DLL holding the same values
+        """
+        dll = DLL(**options)
+        dll.list_to_dll(self)
+        return dll
@@ -1,11 +1,25 @@
 from xml.dom import minidom
-from solution import DLL, Node, fix_playlist
+import asyncio
+from solution import DLL, Node, fix_playlist, diagnose_playlist, LINEAR, CIRCULAR, IMPROPER, SUSPECT, \
+    PlaylistCursor, ArrayDLL, NodePool, UnrolledDLL, ConcurrentDLL, AsyncDLL, \
+    SharedDLL, MappedDLL, NumericDLL, LRUCache, instrumentation
 from typing import TypeVar, List
 from random import seed, randint, shuffle
 import copy
+import multiprocessing
+import pickle
+import os
+import tempfile
+import threading
+import time
 import unittest
 import string
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 # for more information on type hinting, check out https://docs.python.org/3/library/typing.html
 T = TypeVar("T")  # represents generic type
 
@@ -667,6 +681,1496 @@ class DLLTests(unittest.TestCase):
         self.assertTrue(lst.head.prev is lst.tail)
         self.assertTrue(lst.tail.next is lst.head)
 
+    def test_indexed(self):
+
+        # (1) indexed find/find_all agree with a plain scan, including duplicates
+        dll, plain = DLL(indexed=True), DLL()
+        for source in (dll, plain):
+            source.list_to_dll([0, 1, 2, 1, 0])
+            source.push(2, back=False)
+        self.check_dll([2, 0, 1, 2, 1, 0], dll)
+        for val in range(4):
+            self.assertEqual([n.value for n in plain.find_all(val)], [n.value for n in dll.find_all(val)])
+        self.assertIs(dll.head, dll.find(2))
+        self.assertIs(dll.tail, dll.find_all(0)[-1])
+        self.assertIsNone(dll.find([331]))  # unhashable values are never present
+
+        # (2) index follows pop, remove, remove_all and reverse
+        dll.pop()
+        dll.pop(back=False)
+        self.check_dll([0, 1, 2, 1], dll)
+        self.assertEqual(1, len(dll.find_all(0)))
+        self.assertTrue(dll.remove(1))
+        self.check_dll([0, 2, 1], dll)
+        dll.reverse()
+        self.check_dll([1, 2, 0], dll)
+        self.assertIs(dll.head, dll.find(1))
+        self.assertEqual(1, dll.remove_all(2))
+        self.assertEqual([], dll.find_all(2))
+        self.check_dll([1, 0], dll)
+
+        # (3) randomized comparison against list semantics
+        seed(331)
+        dll, lst = DLL(indexed=True), []
+        for _ in range(300):
+            val = randint(0, 9)
+            op = randint(0, 3)
+            if op == 0:
+                dll.push(val, back=val % 2 == 0)
+                lst.append(val) if val % 2 == 0 else lst.insert(0, val)
+            elif op == 1 and lst:
+                dll.pop(back=val % 2 == 0)
+                lst.pop() if val % 2 == 0 else lst.pop(0)
+            elif op == 2:
+                self.assertEqual(val in lst, dll.remove(val))
+                if val in lst:
+                    lst.remove(val)
+            else:
+                self.assertEqual(lst.count(val), dll.remove_all(val))
+                lst = [x for x in lst if x != val]
+            self.check_dll(lst, dll)
+            node = dll.find(val)
+            if val in lst:
+                self.assertEqual(val, node.value)
+                self.assertIs(node, dll.find_all(val)[0])
+            else:
+                self.assertIsNone(node)
+
+    def test_array_dll(self):
+
+        # (1) push/pop on both ends mirror DLL
+        seed(331)
+        dll, array_dll = DLL(), ArrayDLL()
+        self.assertTrue(array_dll.empty())
+        array_dll.pop()  # no-op on empty list
+        for _ in range(200):
+            val, back = randint(0, 9), randint(0, 1) == 1
+            if randint(0, 2):
+                dll.push(val, back)
+                array_dll.push(val, back)
+            else:
+                dll.pop(back)
+                array_dll.pop(back)
+            self.assertEqual(dll.dll_to_list(), array_dll.dll_to_list())
+            self.assertEqual(dll.size, len(array_dll))
+
+        # (2) find/remove/remove_all semantics, slots recycled through the free list
+        array_dll.list_to_dll([0, 1, 2, 1, 0])
+        slot = array_dll.find(1)
+        self.assertEqual(1, array_dll.value(slot))
+        self.assertIsNone(array_dll.find(331))
+        self.assertEqual([1, 1], [array_dll.value(s) for s in array_dll.find_all(1)])
+        self.assertEqual(2, array_dll.remove_all(0))
+        self.assertTrue(array_dll.remove(2))
+        self.assertFalse(array_dll.remove(331))
+        self.assertEqual([1, 1], array_dll.dll_to_list())
+        capacity = len(array_dll._values)
+        array_dll.push(3)
+        array_dll.push(4, back=False)
+        self.assertEqual(capacity, len(array_dll._values))
+        self.assertEqual([4, 1, 1, 3], array_dll.dll_to_list())
+
+        # (3) reverse, equality and repr
+        array_dll.reverse()
+        self.assertEqual([3, 1, 1, 4], array_dll.dll_to_list())
+        array_dll.push(5)
+        array_dll.pop(back=False)
+        self.assertEqual([1, 1, 4, 5], array_dll.dll_to_list())
+        other = ArrayDLL()
+        other.list_to_dll([1, 1, 4, 5])
+        self.assertEqual(other, array_dll)
+        other.pop()
+        self.assertNotEqual(other, array_dll)
+        self.assertEqual("Node(1) <-> Node(1) <-> Node(4)", repr(other))
+
+    def test_node_pool(self):
+
+        # (1) popped nodes are detached and reused by the next push
+        pool = NodePool(maxsize=2)
+        dll = DLL(pool=pool)
+        for i in range(3):
+            dll.push(i)
+        self.assertEqual({"hits": 0, "misses": 3, "pooled": 0}, pool.stats())
+        tail = dll.tail
+        dll.pop()
+        self.check_dll([0, 1], dll)
+        self.assertIsNone(tail.value)
+        self.assertIsNone(tail.prev)
+        dll.push(5, back=False)
+        self.assertIs(tail, dll.head)
+        self.check_dll([5, 0, 1], dll)
+        self.assertEqual(1, pool.hits)
+
+        # (2) removals feed the pool, which stays bounded by maxsize
+        self.assertEqual(1, dll.remove_all(0))
+        dll.pop(back=False)
+        dll.pop()
+        self.check_dll([], dll)
+        self.assertEqual(2, len(pool))
+
+        # (3) a pool can be shared between lists
+        other = DLL(indexed=True, pool=pool)
+        other.list_to_dll([7, 8, 9])
+        self.check_dll([7, 8, 9], other)
+        self.assertEqual({"hits": 3, "misses": 4, "pooled": 0}, pool.stats())
+        self.assertIs(other.tail, other.find(9))
+
+        # (4) removing the ends of a closed playlist keeps it closed and never leaves a link to a pooled node
+        for options in ({}, {"indexed": True, "indexable": True}, {"track_shape": True}):
+            pool = NodePool()
+            dll = DLL(pool=pool, **options)
+            dll.list_to_dll(range(8))
+            self.assertTrue(fix_playlist(dll))
+            self.assertTrue(dll.remove(0))
+            dll.pop()
+            dll.pop(back=False)
+            dll.unlink(dll.tail)
+            del dll[0]
+            DLL(pool=pool).list_to_dll(["other"] * 5)
+            self.assertEqual([3, 4, 5], list(dll))
+            self.assertEqual([5, 4, 3], list(reversed(dll)))
+            self.assertEqual(3, dll.size)
+            self.assertIs(dll.head, dll.tail.next)
+            self.assertIs(dll.tail, dll.head.prev)
+            self.assertTrue(fix_playlist(dll))
+            for _ in range(3):
+                dll.pop()
+            self.assertIsNone(dll.head)
+            self.assertIsNone(dll.tail)
+
+    def test_extend(self):
+
+        # (1) list_to_dll replaces existing contents and accepts any iterable
+        dll = DLL()
+        dll.list_to_dll([1, 2, 3])
+        dll.list_to_dll(range(5))
+        self.check_dll([0, 1, 2, 3, 4], dll)
+        self.assertEqual(5, dll.size)
+        dll.list_to_dll(iter([]))
+        self.check_dll([], dll)
+        self.assertEqual(0, dll.size)
+
+        # (2) extend and extendleft on an empty DLL
+        dll.extend(range(3))
+        self.check_dll([0, 1, 2], dll)
+        dll = DLL()
+        dll.extendleft(range(3))
+        self.check_dll([2, 1, 0], dll)
+        self.assertEqual(3, dll.size)
+
+        # (3) extend and extendleft splice onto existing ends, matching repeated push
+        dll.extend([3, 4])
+        dll.extendleft(x for x in [5, 6])
+        dll.extend([])
+        self.check_dll([6, 5, 2, 1, 0, 3, 4], dll)
+        self.assertEqual(7, dll.size)
+
+        # (4) bulk paths keep the value index and node pool in step
+        pool = NodePool()
+        dll = DLL(indexed=True, pool=pool)
+        dll.list_to_dll([1, 2, 1])
+        dll.extendleft([1, 3])
+        dll.extend([3])
+        self.check_dll([3, 1, 1, 2, 1, 3], dll)
+        self.assertIs(dll.head, dll.find(3))
+        self.assertIs(dll.tail, dll.find_all(3)[-1])
+        self.assertEqual(3, dll.remove_all(1))
+        self.check_dll([3, 2, 3], dll)
+        self.assertEqual(3, len(pool))
+
+    def test_remove_many(self):
+
+        # (1) remove_many on empty DLL and with no matches
+        dll = DLL()
+        self.assertEqual(0, dll.remove_many([1, 2]))
+        dll.list_to_dll([0, 1, 2, 3, 2, 1, 0])
+        self.assertEqual(0, dll.remove_many([]))
+        self.assertEqual(0, dll.remove_many([331]))
+        self.check_dll([0, 1, 2, 3, 2, 1, 0], dll)
+
+        # (2) remove_many removes every instance of each value and keeps size correct
+        self.assertEqual(4, dll.remove_many({0, 2}))
+        self.check_dll([1, 3, 1], dll)
+        self.assertEqual(3, dll.size)
+        self.assertEqual(3, dll.remove_many(iter([1, 3])))
+        self.check_dll([], dll)
+        self.assertEqual(0, dll.size)
+
+        # (3) unhashable values are still matched
+        dll.list_to_dll([[1], (2,), [3], [1]])
+        self.assertEqual(3, dll.remove_many([[1], (2,)]))
+        self.check_dll([[3]], dll)
+
+        # (4) remove_if removes by predicate in one traversal
+        dll.list_to_dll(range(10))
+        self.assertEqual(5, dll.remove_if(lambda v: v % 2 == 0))
+        self.check_dll([1, 3, 5, 7, 9], dll)
+        self.assertEqual(0, dll.remove_if(lambda v: v > 331))
+        self.assertEqual(5, dll.remove_if(lambda v: True))
+        self.check_dll([], dll)
+
+        # (5) indexed DLL answers remove_many from its index
+        dll = DLL(indexed=True)
+        dll.list_to_dll([4, 5, 6, 5, 4])
+        self.assertEqual(4, dll.remove_many([4, 5, 331]))
+        self.check_dll([6], dll)
+        self.assertEqual(1, dll.size)
+        self.assertEqual([], dll.find_all(4))
+
+        # (6) a playlist closed by fix_playlist stays closed, and removing everything leaves it empty
+        for options in ({}, {"indexed": True}, {"track_shape": True}):
+            dll = DLL(**options)
+            dll.list_to_dll([0, 1, 2, 0, 3, 1])
+            self.assertTrue(fix_playlist(dll))
+            self.assertEqual(2, dll.remove_all(0))
+            self.assertEqual(1, dll.remove_if(lambda v: v == 2))
+            self.assertEqual(2, dll.remove_many([1, 331]))
+            self.assertEqual([3], list(dll))
+            self.assertEqual(1, dll.size)
+            self.assertIs(dll.head, dll.tail.next)
+            self.assertIs(dll.tail, dll.head.prev)
+            self.assertTrue(fix_playlist(dll))
+            self.assertEqual(1, dll.remove_all(3))
+            self.assertIsNone(dll.head)
+            self.assertIsNone(dll.tail)
+            self.assertEqual(0, dll.size)
+
+    def test_iteration(self):
+
+        # (1) empty DLL yields nothing
+        dll = DLL()
+        self.assertEqual([], list(dll))
+        self.assertEqual([], list(reversed(dll)))
+        self.assertEqual([], list(dll.iter_nodes()))
+
+        # (2) forward and backward iteration over a linear DLL
+        dll.list_to_dll(range(6))
+        self.assertEqual([0, 1, 2, 3, 4, 5], list(dll))
+        self.assertEqual([5, 4, 3, 2, 1, 0], list(reversed(dll)))
+        nodes = list(dll.iter_nodes())
+        self.assertIs(dll.head, nodes[0])
+        self.assertIs(dll.tail, nodes[-1])
+        self.assertEqual([5, 4], [n.value for n in dll.iter_nodes(reverse=True, limit=2)])
+
+        # (3) start_node and limit bound the traversal
+        start = dll.find(3)
+        self.assertEqual([3, 4, 5], [n.value for n in dll.iter_nodes(start)])
+        self.assertEqual([3, 2, 1, 0], [n.value for n in dll.iter_nodes(start, reverse=True)])
+        self.assertEqual([3], [n.value for n in dll.iter_nodes(start, limit=1)])
+        self.assertEqual([], list(dll.iter_nodes(limit=0)))
+
+        # (4) circular playlists are walked exactly once from any start
+        self.assertTrue(fix_playlist(dll))
+        self.assertEqual([0, 1, 2, 3, 4, 5], list(dll))
+        self.assertEqual([5, 4, 3, 2, 1, 0], list(reversed(dll)))
+        self.assertEqual([3, 4, 5, 0, 1, 2], [n.value for n in dll.iter_nodes(start)])
+        self.assertEqual([3, 2, 1, 0, 5, 4], [n.value for n in dll.iter_nodes(start, reverse=True)])
+
+        # (5) improper loops terminate when a limit is given
+        dll.tail.next = dll.find(2)
+        self.assertEqual([0, 1, 2, 3, 4, 5, 2, 3], [n.value for n in dll.iter_nodes(limit=8)])
+
+    def test_positional(self):
+
+        # (1) __getitem__ with and without the skip layer, including negative and bad positions
+        for indexable in (False, True):
+            dll = DLL(indexable=indexable)
+            with self.assertRaises(IndexError):
+                dll[0]
+            dll.list_to_dll(range(10))
+            self.assertEqual(list(range(10)), [dll[i].value for i in range(10)])
+            self.assertIs(dll.tail, dll[-1])
+            self.assertIs(dll.head, dll[-10])
+            with self.assertRaises(IndexError):
+                dll[10]
+            self.assertEqual(4, dll.index(dll.find(4)))
+            with self.assertRaises(ValueError):
+                dll.index(Node(4))
+
+            # (2) insert clamps like list.insert; del removes by position
+            dll.insert(3, "a")
+            dll.insert(0, "b")
+            dll.insert(331, "c")
+            dll.insert(-2, "d")
+            del dll[1]
+            del dll[-1]
+            expected = ["b", 1, 2, "a", 3, 4, 5, 6, 7, 8, "d", 9]
+            self.check_dll(expected, dll)
+            self.assertEqual(len(expected), dll.size)
+            self.assertEqual(3, dll.index(dll.find("a")))
+
+        # (3) randomized comparison against list, with the value index in step
+        seed(331)
+        dll, lst = DLL(indexed=True, indexable=True), []
+        for step in range(400):
+            val, op = randint(0, 5), randint(0, 6)
+            if op == 0:
+                dll.push(val, back=step % 2 == 0)
+                lst.append(val) if step % 2 == 0 else lst.insert(0, val)
+            elif op == 1 and lst:
+                dll.pop(back=step % 2 == 0)
+                lst.pop() if step % 2 == 0 else lst.pop(0)
+            elif op in (2, 3):
+                i = randint(-len(lst) - 1, len(lst) + 1)
+                dll.insert(i, val)
+                lst.insert(i, val)
+            elif op == 4 and lst:
+                i = randint(-len(lst), len(lst) - 1)
+                del dll[i]
+                del lst[i]
+            elif op == 5:
+                self.assertEqual(lst.count(val), dll.remove_all(val))
+                lst = [x for x in lst if x != val]
+            elif op == 6 and step % 50 == 0:
+                dll.reverse()
+                lst.reverse()
+            self.check_dll(lst, dll)
+            for i in range(len(lst)):
+                self.assertEqual(lst[i], dll[i].value)
+                self.assertEqual(i, dll.index(dll[i]))
+            found = dll.find_all(val)
+            self.assertEqual(lst.count(val), len(found))
+            self.assertEqual(sorted(dll.index(n) for n in found), [dll.index(n) for n in found])
+
+        # (4) bulk loaders keep the skip layer consistent
+        dll = DLL(indexable=True)
+        dll.extend([1, 2])
+        dll.extendleft([3, 4])
+        dll.extend([5])
+        self.assertEqual([4, 3, 1, 2, 5], [dll[i].value for i in range(5)])
+
+        # (5) building the skip layer leaves the global random stream alone
+        seed(331)
+        expected = [randint(0, 100) for _ in range(5)]
+        seed(331)
+        dll = DLL(indexable=True)
+        dll.list_to_dll(range(100))
+        dll.insert(50, -1)
+        self.assertEqual(expected, [randint(0, 100) for _ in range(5)])
+
+    def test_unrolled_dll(self):
+
+        def check_blocks(expected, dll):
+            # values match, size is right, and no block is empty or over capacity
+            self.assertEqual(expected, dll.dll_to_list())
+            self.assertEqual(expected[::-1], list(reversed(dll)))
+            self.assertEqual(len(expected), dll.size)
+            block, prev = dll.head, None
+            while block is not None:
+                self.assertIs(prev, block.prev)
+                self.assertTrue(0 < len(block.values) <= dll.capacity)
+                prev, block = block, block.next
+            self.assertIs(prev, dll.tail)
+
+        # (1) empty list
+        dll = UnrolledDLL(capacity=4)
+        self.assertTrue(dll.empty())
+        dll.pop()
+        self.assertIsNone(dll.find(331))
+        self.assertEqual(0, dll.remove_all(331))
+        check_blocks([], dll)
+
+        # (2) randomized comparison against list with tiny blocks to force splits and merges
+        seed(331)
+        lst = []
+        for step in range(500):
+            val, op = randint(0, 7), randint(0, 7)
+            if op < 2:
+                dll.push(val, back=op == 0)
+                lst.append(val) if op == 0 else lst.insert(0, val)
+            elif op == 2 and lst:
+                dll.pop(back=val % 2 == 0)
+                lst.pop() if val % 2 == 0 else lst.pop(0)
+            elif op in (3, 4):
+                i = randint(-len(lst) - 1, len(lst) + 1)
+                dll.insert(i, val)
+                lst.insert(i, val)
+            elif op == 5:
+                self.assertEqual(val in lst, dll.remove(val))
+                if val in lst:
+                    lst.remove(val)
+            elif op == 6:
+                self.assertEqual(lst.count(val), dll.remove_all(val))
+                lst = [x for x in lst if x != val]
+            elif step % 25 == 0:
+                dll.reverse()
+                lst.reverse()
+            check_blocks(lst, dll)
+            self.assertEqual(lst.index(val) if val in lst else None, dll.find(val))
+            self.assertEqual([i for i, x in enumerate(lst) if x == val], dll.find_all(val))
+
+        # (3) bulk loading, remove_many/remove_if, equality and repr
+        dll.list_to_dll(range(20))
+        check_blocks(list(range(20)), dll)
+        self.assertEqual(4, dll.remove_many([0, 5, 10, 15, 331]))
+        self.assertEqual(4, dll.remove_if(lambda v: v % 5 == 1))
+        expected = [x for x in range(20) if x % 5 not in (0, 1)]
+        check_blocks(expected, dll)
+        other = UnrolledDLL(capacity=3)
+        other.list_to_dll(expected)
+        self.assertEqual(other, dll)
+        other.pop()
+        self.assertNotEqual(other, dll)
+        other.list_to_dll([1, 2])
+        self.assertEqual("Node(1) <-> Node(2)", repr(other))
+
+    def test_concurrent_dll(self):
+
+        # (1) single-threaded semantics match DLL, pop returns the value
+        dll = ConcurrentDLL()
+        self.assertTrue(dll.empty())
+        self.assertIsNone(dll.pop())
+        self.assertIsNone(dll.pop(back=False, timeout=0.01))
+        for i in range(3):
+            dll.push(i)
+        dll.push(-1, back=False)
+        self.assertEqual([-1, 0, 1, 2], dll.dll_to_list())
+        self.assertEqual(4, len(dll))
+        self.assertEqual(2, dll.pop())
+        self.assertEqual(-1, dll.pop(back=False))
+        self.assertEqual(0, dll.pop(back=False))
+        self.assertEqual(1, dll.pop())
+        self.assertTrue(dll.empty())
+        self.assertEqual(0, len(dll))
+
+        # (2) blocking pop wakes up when another thread pushes
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(dll.pop(back=False, timeout=5)))
+        waiter.start()
+        time.sleep(0.05)
+        dll.push("song")
+        waiter.join()
+        self.assertEqual(["song"], result)
+
+        # (3) stress: producers on both ends, consumers on both ends; nothing lost or duplicated
+        producers, consumers, per_producer = 4, 4, 2000
+        consumed = [[] for _ in range(consumers)]
+
+        def produce(p):
+            for i in range(per_producer):
+                dll.push((p, i), back=i % 5 != 0)
+
+        def consume(c):
+            while True:
+                val = dll.pop(back=c % 2 == 0, timeout=0.5)
+                if val is None:
+                    return
+                consumed[c].append(val)
+
+        threads = [threading.Thread(target=produce, args=(p,)) for p in range(producers)]
+        threads += [threading.Thread(target=consume, args=(c,)) for c in range(consumers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        everything = sorted(val for vals in consumed for val in vals)
+        self.assertEqual(sorted((p, i) for p in range(producers) for i in range(per_producer)), everything)
+        self.assertTrue(dll.empty())
+        self.assertEqual(0, len(dll))
+
+    def test_async_dll(self):
+
+        async def scenario():
+            # (1) nowait variants and DLL semantics
+            dll = AsyncDLL(maxsize=2)
+            with self.assertRaises(asyncio.QueueEmpty):
+                dll.pop_nowait()
+            await dll.push(1)
+            await dll.push(0, back=False)
+            self.assertTrue(dll.full())
+            with self.assertRaises(asyncio.QueueFull):
+                dll.push_nowait(2)
+            self.assertEqual("Node(0) <-> Node(1)", repr(dll))
+            self.assertEqual(1, await dll.pop())
+            self.assertEqual(0, await dll.pop(back=False))
+            self.assertTrue(dll.empty())
+
+            # (2) pop waits for data, push waits for room (backpressure)
+            popper = asyncio.create_task(dll.pop(back=False))
+            await asyncio.sleep(0)
+            self.assertFalse(popper.done())
+            await dll.push("a")
+            self.assertEqual("a", await popper)
+            await dll.push("b")
+            await dll.push("c")
+            pusher = asyncio.create_task(dll.push("d"))
+            await asyncio.sleep(0)
+            self.assertFalse(pusher.done())
+            self.assertEqual("b", await dll.pop(back=False))
+            await pusher
+            self.assertEqual(["c", "d"], dll._dll.dll_to_list())
+
+            # (3) a cancelled waiter does not swallow the wakeup meant for others
+            dll = AsyncDLL()
+            first = asyncio.create_task(dll.pop())
+            second = asyncio.create_task(dll.pop())
+            await asyncio.sleep(0)
+            dll.push_nowait("x")
+            first.cancel()
+            self.assertEqual("x", await second)
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+            self.assertEqual(0, len(dll._getters))
+
+            # (4) async for drains the list until it is closed
+            dll = AsyncDLL(maxsize=3)
+
+            async def produce():
+                for i in range(10):
+                    await dll.push(i)
+                dll.close()
+
+            producer = asyncio.create_task(produce())
+            self.assertEqual(list(range(10)), [val async for val in dll])
+            await producer
+            with self.assertRaises(RuntimeError):
+                dll.push_nowait(331)
+
+            # (5) close wakes pushes waiting for room, which then refuse to push
+            dll = AsyncDLL(maxsize=1)
+            await dll.push("full")
+            pushers = [asyncio.create_task(dll.push(i)) for i in range(2)]
+            await asyncio.sleep(0)
+            self.assertFalse(any(pusher.done() for pusher in pushers))
+            dll.close()
+            for pusher in pushers:
+                with self.assertRaises(RuntimeError):
+                    await asyncio.wait_for(pusher, 1)
+            self.assertEqual(0, len(dll._putters))
+            self.assertEqual("full", await dll.pop())
+
+        asyncio.run(scenario())
+
+    def test_shared_dll(self):
+
+        dll = SharedDLL.create(capacity=4, slot_size=8)
+        try:
+            # (1) push/pop/find on the creating side
+            self.assertTrue(dll.empty())
+            self.assertIsNone(dll.pop())
+            dll.push(b"b")
+            dll.push(b"a", back=False)
+            dll.push(bytearray(b"c"))
+            self.assertEqual([b"a", b"b", b"c"], dll.dll_to_list())
+            self.assertEqual(b"b", dll.value(dll.find(b"b")))
+            self.assertIsNone(dll.find(b"bb"))
+            with self.assertRaises(ValueError):
+                dll.push(b"too long!")
+
+            # (2) a second attachment by name sees and mutates the same list
+            other = SharedDLL.attach(dll.name, dll.lock)
+            self.assertEqual([b"a", b"b", b"c"], list(other))
+            other.push(b"d")
+            with self.assertRaises(MemoryError):
+                other.push(b"e")
+            self.assertEqual(b"a", other.pop(back=False))
+            self.assertEqual([b"b", b"c", b"d"], dll.dll_to_list())
+            self.assertTrue(dll.remove(b"c"))
+            self.assertFalse(dll.remove(b"c"))
+            self.assertEqual(2, len(other))
+            other.close()
+
+            # (3) worker processes attach by name and push under the shared lock
+            context = multiprocessing.get_context("fork")
+            workers = [context.Process(target=_shared_worker, args=(dll.name, dll.lock, tag)) for tag in (b"x", b"y")]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+                self.assertEqual(0, worker.exitcode)
+            self.assertEqual([b"b", b"d", b"x", b"y"], sorted(dll.dll_to_list()))
+
+            # (4) a partly consumed iterator does not hold the lock
+            values = iter(dll)
+            next(values)
+            popper = threading.Thread(target=dll.pop)
+            popper.start()
+            popper.join(5)
+            self.assertFalse(popper.is_alive())
+            self.assertEqual(3, len(list(values)))
+            self.assertEqual(3, len(dll))
+        finally:
+            dll.close()
+            dll.unlink()
+
+    def test_mapped_dll(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "playlist.dll")
+
+            # (1) empty list round trip
+            MappedDLL.save(DLL(), path)
+            with MappedDLL(path) as mapped:
+                self.assertTrue(mapped.empty())
+                self.assertEqual([], mapped.dll_to_list())
+                self.assertIsNone(mapped.find(331))
+
+            # (2) values, links and size survive the round trip; traversal runs on the mapping
+            dll = DLL()
+            dll.list_to_dll(["Stand by Me", 1, (2, 3), None, 1, b"\x00"])
+            MappedDLL.save(dll, path)
+            with MappedDLL(path) as mapped:
+                self.assertEqual(6, len(mapped))
+                self.assertEqual(dll.dll_to_list(), mapped.dll_to_list())
+                self.assertEqual(list(reversed(dll)), list(reversed(mapped)))
+                self.assertEqual("Stand by Me", mapped.value(mapped.head))
+                self.assertEqual(b"\x00", mapped.value(mapped.tail))
+                self.assertEqual([1, 1], [mapped.value(s) for s in mapped.find_all(1)])
+                self.assertEqual((2, 3), mapped.value(mapped.find((2, 3))))
+                self.assertIsNone(mapped.find(331))
+                self.assertEqual(dll, mapped.to_dll())
+
+            # (3) files that are not MappedDLL files are rejected
+            with open(path, "wb") as file:
+                file.write(b"not a playlist")
+            with self.assertRaises(ValueError):
+                MappedDLL(path)
+            with open(path, "wb") as file:
+                file.write(MappedDLL.MAGIC + bytes(8))
+            with self.assertRaises(ValueError):
+                MappedDLL(path)
+
+    def test_pickle_copy(self):
+
+        # (1) long lists pickle and copy without recursing through the Node chain
+        dll = DLL()
+        dll.list_to_dll(range(20000))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(dll, pickle.loads(pickle.dumps(dll, protocol)))
+        self.assertEqual(dll, copy.deepcopy(dll))
+        self.assertEqual(dll, copy.copy(dll))
+
+        # (2) shallow copy shares values, deep copy does not; both get fresh Nodes
+        dll = DLL()
+        dll.list_to_dll([[1], [2]])
+        shallow, deep = copy.copy(dll), copy.deepcopy(dll)
+        self.check_dll([[1], [2]], shallow)
+        self.check_dll([[1], [2]], deep)
+        self.assertIs(dll.head.value, shallow.head.value)
+        self.assertIsNot(dll.head, shallow.head)
+        self.assertIsNot(dll.head.value, deep.head.value)
+
+        # (3) deepcopy memo keeps shared values shared, and copies keep optional features
+        shared = [331]
+        dll = DLL(indexable=True)
+        dll.list_to_dll([shared, shared, 5])
+        deep = copy.deepcopy(dll)
+        self.assertIs(deep.head.value, deep.head.next.value)
+        self.assertIs(deep.tail, deep[2])
+        dll = DLL(indexed=True)
+        dll.list_to_dll([4, 5, 4])
+        loaded = pickle.loads(pickle.dumps(dll))
+        self.assertIs(loaded.tail, loaded.find_all(4)[-1])
+        self.assertEqual(dll, loaded)
+
+        # (4) circular playlists stay circular
+        dll = DLL()
+        dll.list_to_dll([1, 2, 3, 4])
+        fix_playlist(dll)
+        for other in (copy.copy(dll), copy.deepcopy(dll), pickle.loads(pickle.dumps(dll))):
+            self.assertEqual([1, 2, 3, 4], list(other))
+            self.assertIs(other.tail.next, other.head)
+            self.assertIs(other.head.prev, other.tail)
+
+        # (5) protocol 5 ships bytes-like values out-of-band and restores their types
+        dll = DLL()
+        payload = b"x" * 1000
+        dll.list_to_dll([payload, bytearray(b"yz"), "text"])
+        buffers = []
+        data = pickle.dumps(dll, protocol=5, buffer_callback=buffers.append)
+        self.assertEqual(2, len(buffers))
+        self.assertLess(len(data), 1000)
+        loaded = pickle.loads(data, buffers=buffers)
+        self.assertIs(payload, loaded.head.value)
+        self.assertEqual([payload, bytearray(b"yz"), "text"], list(loaded))
+        self.assertIs(bytearray, type(loaded.head.next.value))
+        self.assertEqual(dll, pickle.loads(pickle.dumps(dll, protocol=5)))
+
+    def test_playlist_shape(self):
+
+        # (1) odd-length broken playlists are closed in both directions
+        for n in range(1, 8):
+            lst = DLL()
+            lst.list_to_dll(range(n))
+            self.assertTrue(fix_playlist(lst))
+            self.assertIs(lst.tail.next, lst.head)
+            self.assertIs(lst.head.prev, lst.tail)
+
+        # (2) diagnostics for linear, circular, improper and mis-sized playlists
+        lst = DLL()
+        self.assertEqual(LINEAR, diagnose_playlist(lst)["state"])
+        lst.list_to_dll(range(7))
+        report = diagnose_playlist(lst)
+        self.assertEqual((LINEAR, 7, None, 0), (report["state"], report["nodes"], report["cycle_entry"],
+                                                report["cycle_length"]))
+        fix_playlist(lst)
+        report = diagnose_playlist(lst)
+        self.assertEqual((CIRCULAR, 7, 7), (report["state"], report["nodes"], report["cycle_length"]))
+        self.assertIs(lst.head, report["cycle_entry"])
+        entry = lst.find(2)
+        lst.tail.next = entry
+        report = diagnose_playlist(lst)
+        self.assertEqual((IMPROPER, 7, 5), (report["state"], report["nodes"], report["cycle_length"]))
+        self.assertIs(entry, report["cycle_entry"])
+        self.assertLessEqual(report["steps"], 5 * (lst.size + 1))
+        lst.size = 3  # size no longer matches the links: traversal stays bounded
+        report = diagnose_playlist(lst)
+        self.assertEqual(SUSPECT, report["state"])
+        self.assertLessEqual(report["steps"], 5 * (lst.size + 1))
+        lst = DLL(lazy_reverse=True)
+        lst.list_to_dll(range(7))
+        lst.reverse()  # a lazily reversed list is diagnosed without rewiring it
+        links = [(node.prev, node.next) for node in lst.iter_nodes()]
+        self.assertEqual(LINEAR, diagnose_playlist(lst)["state"])
+        self.assertTrue(lst._flipped)
+        self.assertEqual(links, [(node.prev, node.next) for node in lst.iter_nodes()])
+        fix_playlist(lst)
+        lst.reverse()
+        report = diagnose_playlist(lst)
+        self.assertEqual((CIRCULAR, 7), (report["state"], report["nodes"]))
+        self.assertIs(lst.head, report["cycle_entry"])
+        self.assertTrue(lst._flipped)
+
+        # (3) tracked shape answers repeat checks without walking the list
+        lst = DLL(track_shape=True)
+        lst.list_to_dll(range(5))
+        lst.push(5)
+        lst.remove(0)
+        self.assertTrue(fix_playlist(lst))
+        self.assertIs(lst.tail.next, lst.head)
+        self.assertIs(lst.head.prev, lst.tail)
+        lst.head.next.next = None  # would fail a full check, but the tracked shape is trusted
+        self.assertTrue(fix_playlist(lst))
+        lst.invalidate_shape()
+        lst.head.next.next = lst.head.next  # improper loop
+        self.assertFalse(fix_playlist(lst))
+        self.assertFalse(fix_playlist(lst))
+
+        # (4) DLL methods on a circular playlist force the next check to run in full
+        lst = DLL(track_shape=True)
+        lst.list_to_dll(range(4))
+        fix_playlist(lst)
+        lst.push(-1, back=False)  # tail still links to the old head: improper
+        self.assertFalse(fix_playlist(lst))
+        lst.list_to_dll(range(4))
+        self.assertTrue(fix_playlist(lst))
+        lst.push(4)  # forward links end at the new tail: broken, fixed by the next check
+        self.assertTrue(fix_playlist(lst))
+        self.assertEqual([0, 1, 2, 3, 4], list(lst))
+        self.assertIs(lst.tail.next, lst.head)
+        self.assertEqual(CIRCULAR, diagnose_playlist(lst)["state"])
+
+    def test_playlist_cursor(self):
+
+        # (1) empty playlist
+        cursor = PlaylistCursor(DLL())
+        self.assertIsNone(cursor.next())
+        self.assertIsNone(cursor.skip(3))
+        self.assertEqual([], list(cursor.shuffle()))
+
+        # (2) next/prev wrap around on linear and circular playlists
+        for circular in (False, True):
+            lst = DLL()
+            lst.list_to_dll(range(5))
+            if circular:
+                fix_playlist(lst)
+            cursor = PlaylistCursor(lst)
+            self.assertIs(lst.head, cursor.node)
+            self.assertEqual([1, 2, 3, 4, 0, 1], [cursor.next().value for _ in range(6)])
+            self.assertEqual([0, 4, 3], [cursor.prev().value for _ in range(3)])
+            self.assertIs(lst.find(2), cursor.seek_to(lst.find(2)))
+
+            # (3) skip both ways, taking the shorter direction
+            self.assertEqual(4, cursor.skip(2).value)
+            self.assertEqual(3, cursor.skip(4).value)
+            self.assertEqual(0, cursor.skip(-3).value)
+            self.assertEqual(0, cursor.skip(10).value)
+
+        # (4) shuffle yields every track exactly once and moves the cursor
+        for indexable in (False, True):
+            lst = DLL(indexable=indexable)
+            lst.list_to_dll(range(50))
+            cursor = PlaylistCursor(lst)
+            order = []
+            for node in cursor.shuffle(seed=331):
+                self.assertIs(node, cursor.node)
+                order.append(node.value)
+            self.assertEqual(list(range(50)), sorted(order))
+            self.assertNotEqual(list(range(50)), order)
+            self.assertEqual(order, [node.value for node in PlaylistCursor(lst).shuffle(seed=331)])
+
+        # (5) a default playlist gets its skip layer when a shuffle starts, reversed and closed ones included
+        for options in ({}, {"lazy_reverse": True}, {"track_shape": True}):
+            lst = DLL(**options)
+            lst.list_to_dll(range(49, -1, -1) if options.get("lazy_reverse") else range(50))
+            if options.get("lazy_reverse"):
+                lst.reverse()
+            if options.get("track_shape"):
+                fix_playlist(lst)
+            shuffled = PlaylistCursor(lst).shuffle(seed=331)
+            self.assertEqual(order[0], next(shuffled).value)
+            self.assertIsNotNone(lst._skip)
+            self.assertEqual(order[1:], [node.value for node in shuffled])
+            self.assertEqual(list(range(50)), [lst[i].value for i in range(50)])
+
+    def test_lazy_reverse(self):
+
+        # (1) reverse only flips the orientation; Node links are rewired by materialize
+        lst = DLL(lazy_reverse=True)
+        lst.list_to_dll([1, 2, 3])
+        first = lst.head
+        lst.reverse()
+        self.assertEqual([3, 2, 1], lst.dll_to_list())
+        self.assertEqual([1, 2, 3], list(reversed(lst)))
+        self.assertEqual(3, lst.head.value)
+        self.assertIs(first.next.prev, first)  # untouched
+        lst.materialize()
+        self.check_dll([3, 2, 1], lst)
+        lst.reverse()
+        lst.reverse()
+        self.assertEqual("Node(3) <-> Node(2) <-> Node(1)", repr(lst))
+
+        # (2) every operation agrees with a python list while flipped, with all auxiliary structures
+        seed(331)
+        for options in ({}, {"indexed": True}, {"indexable": True},
+                        {"indexed": True, "indexable": True, "pool": NodePool()}):
+            lst = DLL(lazy_reverse=True, **options)
+            expected = []
+            for _ in range(600):
+                op = randint(0, 9)
+                val = randint(0, 5)
+                if op == 0:
+                    lst.reverse()
+                    expected.reverse()
+                elif op == 1:
+                    lst.push(val)
+                    expected.append(val)
+                elif op == 2:
+                    lst.push(val, back=False)
+                    expected.insert(0, val)
+                elif op == 3 and expected:
+                    lst.pop(back=bool(val % 2))
+                    expected.pop(-1 if val % 2 else 0)
+                elif op == 4:
+                    pos = randint(-3, len(expected) + 2)
+                    lst.insert(pos, val)
+                    expected.insert(pos, val)
+                elif op == 5:
+                    self.assertEqual(val in expected, lst.remove(val))
+                    if val in expected:
+                        expected.remove(val)
+                elif op == 6:
+                    lst.extend([val, val + 1])
+                    expected.extend([val, val + 1])
+                elif op == 7:
+                    lst.extendleft([val, val + 1])
+                    expected[:0] = [val + 1, val]
+                elif op == 8 and expected:
+                    pos = randint(0, len(expected) - 1)
+                    self.assertEqual(expected[pos], lst[pos].value)
+                    self.assertEqual(pos, lst.index(lst[pos]))
+                    del lst[pos]
+                    del expected[pos]
+                elif op == 9:
+                    found = lst.find_all(val)
+                    self.assertEqual(expected.count(val), len(found))
+                    if found:
+                        self.assertIs(found[0], lst.find(val))
+                        self.assertEqual(expected.index(val), lst.index(found[0]))
+                self.assertEqual(expected, lst.dll_to_list())
+                self.assertEqual(len(expected), lst.size)
+            self.assertEqual(expected[::-1], list(reversed(lst)))
+            self.assertEqual(expected.count(3), lst.remove_all(3))
+            lst.materialize()
+            self.check_dll([val for val in expected if val != 3], lst)
+
+        # (3) copies, equality, cursors and fix_playlist see the logical order
+        lst = DLL(lazy_reverse=True)
+        lst.list_to_dll(range(5))
+        lst.reverse()
+        other = DLL()
+        other.list_to_dll(range(4, -1, -1))
+        self.assertEqual(other, lst)
+        self.assertEqual(other, copy.copy(lst))
+        self.assertEqual([4, 3, 2, 1, 0], pickle.loads(pickle.dumps(lst)).dll_to_list())
+        cursor = PlaylistCursor(lst)
+        self.assertEqual([3, 2, 1, 0, 4], [cursor.next().value for _ in range(5)])
+        self.assertEqual([0, 1], [cursor.prev().value for _ in range(2)])
+        self.assertTrue(fix_playlist(lst))
+        self.assertIs(lst.head, lst.tail.next)
+        self.assertEqual(4, lst.head.value)
+        lst.reverse()
+        self.assertEqual([0, 1, 2, 3, 4], list(lst))
+        self.assertTrue(fix_playlist(lst))
+        self.assertEqual([0, 1, 2, 3, 4], list(lst))
+
+    def test_instrumentation(self):
+
+        # (1) disabled by default: DLL and Node are untouched and nothing is recorded
+        push, next_slot = DLL.push, vars(Node)["next"]
+        self.assertFalse(instrumentation.enabled)
+        lst = DLL()
+        lst.list_to_dll(range(10))
+        self.assertEqual({}, instrumentation.snapshot())
+
+        instrumentation.enable()
+        try:
+            # (2) calls, latency buckets and node visits per operation
+            lst.find(9)
+            lst.find(9)
+            lst.remove_all(3)
+            self.assertTrue(fix_playlist(lst))
+            stats = instrumentation.snapshot()
+            self.assertEqual(2, stats["find"]["calls"])
+            self.assertEqual(2, stats["_find_nodes"]["calls"])
+            self.assertEqual(18, stats["_find_nodes"]["node_visits"])
+            self.assertEqual(0, stats["find"]["node_visits"])
+            self.assertEqual(1, stats["remove_all"]["calls"])
+            self.assertEqual(1, stats["_remove_node"]["calls"])
+            self.assertEqual(1, stats["fix_playlist"]["calls"])
+            self.assertGreater(stats["fix_playlist"]["node_visits"], 0)
+            buckets = stats["find"]["buckets"]
+            self.assertEqual(2, buckets[float("inf")])
+            self.assertEqual(sorted(buckets.values()), list(buckets.values()))
+            self.assertGreaterEqual(stats["find"]["seconds"], 0)
+
+            # (3) Prometheus text exposition
+            text = instrumentation.prometheus()
+            self.assertIn("# TYPE dll_operation_seconds histogram\n", text)
+            self.assertIn('dll_operation_seconds_bucket{op="find",le="+Inf"} 2\n', text)
+            self.assertIn('dll_operation_seconds_count{op="fix_playlist"} 1\n', text)
+            self.assertIn('dll_node_visits_total{op="_find_nodes"} 18\n', text)
+        finally:
+            instrumentation.disable()
+            instrumentation.reset()
+
+        # (4) disable restores the originals and reset clears the data
+        self.assertIs(push, DLL.push)
+        self.assertIs(next_slot, vars(Node)["next"])
+        lst.find(0)
+        self.assertEqual({}, instrumentation.snapshot())
+        self.assertEqual([0, 1, 2, 4, 5, 6, 7, 8, 9], list(lst))
+
+    def test_fingerprint(self):
+
+        def fresh(values):
+            result = DLL(fingerprint=True)
+            result.list_to_dll(values)
+            return result
+
+        # (1) identity and size short-circuit; unfingerprinted lists have no fingerprint
+        lst = DLL()
+        lst.list_to_dll([1, 2, 3])
+        self.assertIsNone(lst.fingerprint())
+        self.assertEqual(lst, lst)
+        other = DLL()
+        other.list_to_dll([1, 2])
+        self.assertNotEqual(lst, other)
+        self.assertEqual(fresh([]).fingerprint(), DLL(fingerprint=True).fingerprint())
+
+        # (2) the fingerprint always matches that of a list built from the same values
+        seed(331)
+        for options in ({}, {"lazy_reverse": True}, {"indexed": True, "indexable": True}):
+            lst = DLL(fingerprint=True, **options)
+            expected = []
+            for _ in range(400):
+                op = randint(0, 7)
+                val = randint(0, 4)
+                if op == 0:
+                    lst.reverse()
+                    expected.reverse()
+                elif op == 1:
+                    lst.push(val, back=bool(val % 2))
+                    expected.insert(len(expected) if val % 2 else 0, val)
+                elif op == 2 and expected:
+                    lst.pop(back=bool(val % 2))
+                    expected.pop(-1 if val % 2 else 0)
+                elif op == 3:
+                    pos = randint(0, len(expected))
+                    lst.insert(pos, val)
+                    expected.insert(pos, val)
+                elif op == 4 and val in expected:
+                    lst.remove(val)
+                    expected.remove(val)
+                elif op == 5:
+                    lst.extend([val, val + 1])
+                    expected.extend([val, val + 1])
+                elif op == 6:
+                    lst.extendleft([val, val + 1])
+                    expected[:0] = [val + 1, val]
+                elif op == 7:
+                    lst.remove_all(val)
+                    expected = [item for item in expected if item != val]
+                self.assertEqual(fresh(expected).fingerprint(), lst.fingerprint())
+            self.assertEqual(fresh(expected), lst)
+            self.assertEqual(fresh(expected).fingerprint(), copy.copy(lst).fingerprint())
+            self.assertEqual(fresh(expected).fingerprint(), pickle.loads(pickle.dumps(lst)).fingerprint())
+
+        # (3) order sensitive, and unequal lists of equal size are rejected without walking them
+        self.assertNotEqual(fresh([1, 2, 3]).fingerprint(), fresh([3, 2, 1]).fingerprint())
+        first, second = fresh(range(100)), fresh(range(99, -1, -1))
+        instrumentation.enable()
+        try:
+            self.assertNotEqual(first, second)
+            self.assertEqual(0, instrumentation.snapshot()["__eq__"]["node_visits"])
+            self.assertEqual(first, fresh(range(100)))
+            self.assertGreater(instrumentation.snapshot()["__eq__"]["node_visits"], 0)
+        finally:
+            instrumentation.disable()
+            instrumentation.reset()
+
+    def test_bounded_repr(self):
+
+        # (1) short lists print in full
+        lst = DLL()
+        lst.list_to_dll(range(20))
+        self.assertEqual(" <-> ".join(f"Node({i})" for i in range(20)), repr(lst))
+
+        # (2) longer lists show the first and last REPR_ITEMS nodes and the size
+        lst.list_to_dll(range(100000))
+        expected = " <-> ".join(f"Node({i})" for i in range(10)) + " <-> ... <-> " + \
+            " <-> ".join(f"Node({i})" for i in range(99990, 100000)) + " (size=100000)"
+        self.assertEqual(expected, repr(lst))
+        self.assertEqual(expected, str(lst))
+        unrolled = UnrolledDLL(8)
+        unrolled.list_to_dll(range(100000))
+        self.assertEqual(expected, repr(unrolled))
+        lst.reverse()
+        self.assertTrue(repr(lst).startswith("Node(99999) <-> Node(99998)"))
+        self.assertTrue(repr(lst).endswith("Node(1) <-> Node(0) (size=100000)"))
+        for other in (ArrayDLL(), ConcurrentDLL()):
+            for i in range(100000):
+                other.push(i)
+            self.assertEqual(expected, repr(other))
+        other.pop(back=False)
+        other.pop()
+        self.assertTrue(repr(other).startswith("Node(1) <-> Node(2)"))
+        self.assertTrue(repr(other).endswith("Node(99997) <-> Node(99998) (size=99998)"))
+        shared = SharedDLL.create(capacity=30, slot_size=4)
+        try:
+            for i in range(30):
+                shared.push(str(i).encode())
+            self.assertTrue(repr(shared).startswith("Node(b'0') <-> Node(b'1')"))
+            self.assertTrue(repr(shared).endswith("Node(b'28') <-> Node(b'29') (size=30)"))
+        finally:
+            shared.close()
+            shared.unlink()
+
+        # (3) a circular playlist is printed once round
+        lst.list_to_dll(range(21))
+        fix_playlist(lst)
+        self.assertTrue(repr(lst).endswith("Node(20) (size=21)"))
+
+        # (4) write_to streams the untruncated repr in chunks
+        class Sink:
+            def __init__(self):
+                self.writes = []
+
+            def write(self, text):
+                self.writes.append(text)
+
+        lst.list_to_dll(range(2500))
+        sink = Sink()
+        self.assertEqual(2500, lst.write_to(sink))
+        self.assertEqual(3, len(sink.writes))
+        self.assertEqual(" <-> ".join(f"Node({i})" for i in range(2500)), "".join(sink.writes))
+        with tempfile.TemporaryFile("w+") as fp:
+            self.assertEqual(2500, lst.write_to(fp, sep="\n", fmt=lambda node: str(node.value), chunk=7))
+            fp.seek(0)
+            self.assertEqual([str(i) for i in range(2500)], fp.read().split("\n"))
+        sink = Sink()
+        self.assertEqual(0, DLL().write_to(sink))
+        self.assertEqual([], sink.writes)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numeric_dll(self):
+
+        # (1) in-order storage answers with vectorized masks, and exports without Python objects
+        lst = NumericDLL()
+        lst.list_to_dll([5, 3, 5, 1, 5])
+        self.assertEqual([5, 3, 5, 1, 5], lst.dll_to_list())
+        exported = lst.to_numpy()
+        self.assertIsInstance(exported, numpy.ndarray)
+        self.assertEqual(numpy.int64, exported.dtype)
+        self.assertEqual([0, 2, 4], lst.find_all(5))
+        self.assertEqual(1, lst.find(3))
+        self.assertIsNone(lst.find(7))
+        self.assertEqual(3, lst.remove_all(5))
+        self.assertEqual([3, 1], lst.dll_to_list())
+        self.assertEqual("Node(3) <-> Node(1)", repr(lst))
+
+        # (2) agrees with a python list through pushes, pops, removals and reversal, int32 links included
+        seed(331)
+        for links in (numpy.int64, numpy.int32):
+            lst = NumericDLL(links=links, capacity=2)
+            expected = []
+            for _ in range(500):
+                op = randint(0, 6)
+                val = randint(0, 5)
+                if op == 0:
+                    lst.push(val)
+                    expected.append(val)
+                elif op == 1:
+                    lst.push(val, back=False)
+                    expected.insert(0, val)
+                elif op == 2 and expected:
+                    lst.pop(back=bool(val % 2))
+                    expected.pop(-1 if val % 2 else 0)
+                elif op == 3:
+                    self.assertEqual(val in expected, lst.remove(val))
+                    if val in expected:
+                        expected.remove(val)
+                elif op == 4:
+                    self.assertEqual(expected.count(val), lst.remove_all(val))
+                    expected = [item for item in expected if item != val]
+                elif op == 5:
+                    lst.reverse()
+                    expected.reverse()
+                elif op == 6:
+                    found = lst.find_all(val)
+                    self.assertEqual([val] * expected.count(val), [lst.value(slot) for slot in found])
+                self.assertEqual(expected, lst.dll_to_list())
+                self.assertEqual(len(expected), len(lst))
+            self.assertEqual(links, lst._next.dtype)
+
+        # (3) remove_many, float values and equality
+        lst = NumericDLL(dtype=numpy.float64)
+        lst.list_to_dll(numpy.linspace(0, 1, 5))
+        self.assertEqual(2, lst.remove_many([0.25, 1.0, 7]))
+        self.assertEqual([0.0, 0.5, 0.75], list(lst))
+        other = NumericDLL(dtype=numpy.float64)
+        for val in (0.75, 0.5, 0.0):
+            other.push(val, back=False)
+        self.assertEqual(lst, other)
+        other.pop()
+        self.assertNotEqual(lst, other)
+
+        # (4) values the dtype cannot hold exactly are rejected, leaving the list unchanged
+        lst = NumericDLL()
+        lst.push(2.0)
+        for val in (2.7, float("nan"), 2 ** 63):
+            with self.assertRaises(ValueError):
+                lst.push(val)
+        with self.assertRaises(ValueError):
+            lst.list_to_dll([1, 2.5])
+        self.assertEqual([2], lst.dll_to_list())
+        self.assertIsNone(lst.find(2.7))
+        small = NumericDLL(dtype=numpy.int8)
+        with self.assertRaises(ValueError):
+            small.push(300)
+        small.list_to_dll(numpy.arange(-5, 5))
+        self.assertEqual(10, len(small))
+        floats = NumericDLL(dtype=numpy.float32)  # float rounding is not a loss, overflowing to inf is
+        floats.list_to_dll([0.1, float("nan")])
+        floats.push(0.1)
+        floats.push(3)
+        self.assertEqual(4, len(floats))
+        for bad in (1e40, 1j, "3"):
+            with self.assertRaises(ValueError), numpy.errstate(over="ignore"):
+                floats.push(bad)
+        with self.assertRaises(ValueError):
+            floats.list_to_dll([1.0, 1e40])
+        self.assertEqual(4, len(floats))
+        empty = NumericDLL()
+        empty.list_to_dll([])
+        self.assertTrue(empty.empty())
+        self.assertEqual([], list(empty.to_numpy()))
+
+        # (4) repr matches a DLL and stays bounded when the storage is out of order
+        lst = NumericDLL()
+        lst.list_to_dll(range(1000))
+        lst.reverse()
+        dll = DLL()
+        dll.list_to_dll(range(999, -1, -1))
+        self.assertEqual(repr(dll), repr(lst))
+        self.assertIsNone(lst._order)
+
+    def test_relink(self):
+
+        # (1) concat moves the nodes over and empties the other list
+        first, second = DLL(), DLL()
+        first.list_to_dll([1, 2, 3])
+        second.list_to_dll([4, 5])
+        moved = second.head
+        first.concat(second)
+        self.check_dll([1, 2, 3, 4, 5], first)
+        self.check_dll([], second)
+        self.assertIs(moved, first.find(4))
+        first.concat(DLL())
+        self.check_dll([1, 2, 3, 4, 5], first)
+        with self.assertRaises(ValueError):
+            first.concat(first)
+
+        # (2) split_after, with and without the count; sizes without it are counted when next used
+        for count in (None, 2):
+            lst = DLL()
+            lst.list_to_dll(range(5))
+            rest = lst.split_after(lst.find(2), count)
+            self.assertEqual(None if count is None else 3, lst._size)
+            self.check_dll([0, 1, 2], lst)
+            self.check_dll([3, 4], rest)
+            self.check_dll([], lst.split_after(lst.tail))
+            self.check_dll([], rest.split_after(rest.head).split_after(rest.head))
+
+        # (3) splice a run into another list or elsewhere in the same one
+        source, dest = DLL(), DLL()
+        source.list_to_dll(range(6))
+        dest.list_to_dll(["a", "b"])
+        source.splice(source.find(1), source.find(3), dest, dest.head, count=3)
+        self.check_dll([0, 4, 5], source)
+        self.check_dll(["a", 1, 2, 3, "b"], dest)
+        dest.splice(dest.find(2), dest.tail, source)
+        self.check_dll([2, 3, "b", 0, 4, 5], source)
+        self.check_dll(["a", 1], dest)
+        source.splice(source.head, source.find(3), source, source.tail)
+        self.check_dll(["b", 0, 4, 5, 2, 3], source)
+        dest.splice(dest.head, dest.tail, source, source.find(5))
+        self.check_dll(["b", 0, 4, 5, "a", 1, 2, 3], source)
+        self.check_dll([], dest)
+
+        # (4) optional features follow the nodes; closed and lazily reversed lists are opened and oriented first
+        seed(331)
+        for options in ({"indexed": True, "indexable": True}, {"fingerprint": True}, {"lazy_reverse": True},
+                        {"track_shape": True}):
+            first, second = DLL(**options), DLL(**options)
+            first.list_to_dll([randint(0, 3) for _ in range(8)])
+            second.list_to_dll([randint(0, 3) for _ in range(8)])
+            first.reverse()
+            fix_playlist(second)
+            values = list(first) + list(second)
+            first.concat(second)
+            rest = first.split_after(first[4])
+            rest.splice(rest[2], rest[5], first, first.head)
+            kept = values[5:]
+            for lst, expected in ((first, values[:1] + kept[2:6] + values[1:5]), (rest, kept[:2] + kept[6:]),
+                                  (second, [])):
+                fresh = DLL(**options)
+                fresh.list_to_dll(expected)
+                self.assertEqual(expected, list(lst))
+                self.assertEqual(fresh, lst)
+                self.assertEqual(fresh.fingerprint(), lst.fingerprint())
+                self.assertEqual(len(expected), lst.size)
+                for val in range(4):
+                    self.assertEqual(expected.count(val), len(lst.find_all(val)))
+                    if val in expected:
+                        self.assertEqual(expected.index(val), lst.index(lst.find(val)))
+                self.assertTrue(fix_playlist(lst))
+
+    def test_sort(self):
+
+        # (1) small cases, and Node handles survive the sort
+        lst = DLL()
+        lst.sort()
+        self.check_dll([], lst)
+        lst.list_to_dll([3, 1, 2])
+        nodes = list(lst.iter_nodes())
+        lst.sort()
+        self.check_dll([1, 2, 3], lst)
+        self.assertTrue(all(a is b for a, b in zip(nodes[1:] + nodes[:1], lst.iter_nodes())))
+
+        # (2) matches sorted(), stably, for keys and reverse, with every option
+        seed(331)
+        pairs = [(randint(0, 9), i) for i in range(300)]
+        for options in ({}, {"indexed": True, "indexable": True}, {"fingerprint": True}, {"lazy_reverse": True}):
+            for key, reverse in ((None, False), (None, True), (lambda pair: pair[0], False),
+                                 (lambda pair: -pair[0], True)):
+                lst = DLL(**options)
+                lst.list_to_dll(pairs)
+                lst.reverse()
+                lst.sort(key=key, reverse=reverse)
+                expected = sorted(pairs[::-1], key=key, reverse=reverse)
+                self.check_dll(expected, lst)
+                fresh = DLL(**options)
+                fresh.list_to_dll(expected)
+                self.assertEqual(fresh.fingerprint(), lst.fingerprint())
+                self.assertEqual(expected.index(pairs[7]), lst.index(lst.find(pairs[7])))
+
+        # (3) a closed playlist stays closed
+        lst = DLL(track_shape=True)
+        lst.list_to_dll([5, 4, 6, 1])
+        fix_playlist(lst)
+        lst.sort()
+        self.assertEqual([1, 4, 5, 6], list(lst))
+        self.assertIs(lst.head, lst.tail.next)
+        self.assertIs(lst.tail, lst.head.prev)
+        self.assertTrue(fix_playlist(lst))
+
+        # (4) insert_sorted keeps the DLL sorted, after equal values
+        for indexable in (False, True):
+            for key, reverse in ((None, False), (lambda pair: pair[0], True)):
+                lst = DLL(indexable=indexable)
+                for pair in pairs[:150]:
+                    lst.insert_sorted(pair if key else pair[0], key=key, reverse=reverse)
+                expected = sorted(pairs[:150], key=lambda pair: pair[0], reverse=reverse)
+                self.check_dll(expected if key else [pair[0] for pair in expected], lst)
+
+    def test_dedupe(self):
+
+        # (1) keep first / last, with size, head and tail kept right
+        lst = DLL()
+        self.assertEqual(0, lst.dedupe())
+        lst.list_to_dll([1, 2, 1, 3, 2, 1])
+        self.assertEqual(3, lst.dedupe())
+        self.check_dll([1, 2, 3], lst)
+        lst.list_to_dll([1, 2, 1, 3, 2, 1])
+        self.assertEqual(3, lst.dedupe(keep="last"))
+        self.check_dll([3, 2, 1], lst)
+        with self.assertRaises(ValueError):
+            lst.dedupe(keep="middle")
+
+        # (2) keys, unhashable values and keys
+        lst.list_to_dll(["a", "B", "b", "A", "c"])
+        self.assertEqual(2, lst.dedupe(key=str.lower))
+        self.check_dll(["a", "B", "c"], lst)
+        lst.list_to_dll([[1], (2,), [1], 3, (2,), [3], 3])
+        self.assertEqual(3, lst.dedupe())
+        self.assertEqual([[1], (2,), 3, [3]], list(lst))
+        self.assertEqual(4, lst.size)
+        lst.list_to_dll([1, 2, 3, 4])
+        self.assertEqual(2, lst.dedupe(key=lambda val: [val % 2]))
+        self.check_dll([1, 2], lst)
+
+        # (3) agrees with a python implementation under every option, closed playlists included
+        seed(331)
+        values = [randint(0, 20) for _ in range(200)]
+        for options in ({}, {"indexed": True}, {"indexed": True, "indexable": True, "pool": NodePool()},
+                        {"fingerprint": True}, {"lazy_reverse": True}, {"track_shape": True}):
+            for keep in ("first", "last"):
+                lst = DLL(**options)
+                lst.list_to_dll(values)
+                if options.get("track_shape"):
+                    fix_playlist(lst)
+                    lst.reverse()
+                    lst.reverse()
+                source = list(lst)
+                order = source if keep == "first" else source[::-1]
+                kept = [val for i, val in enumerate(order) if val not in order[:i]]
+                expected = kept if keep == "first" else kept[::-1]
+                self.assertEqual(len(source) - len(expected), lst.dedupe(keep=keep))
+                self.assertEqual(expected, list(lst))
+                self.assertEqual(len(expected), lst.size)
+                fresh = DLL(**options)
+                fresh.list_to_dll(expected)
+                self.assertEqual(fresh.fingerprint(), lst.fingerprint())
+                self.assertEqual(expected[-1], lst[-1].value)
+                self.assertEqual(1, len(lst.find_all(expected[0])))
+                if options.get("track_shape"):
+                    self.assertTrue(fix_playlist(lst))
+
+    def test_node_handles(self):
+
+        # (1) push and insert return their Node
+        lst = DLL()
+        first = lst.push(1)
+        self.assertIsInstance(first, Node)
+        self.assertIs(first, lst.head)
+        self.assertIs(lst.push(0, back=False), lst.head)
+        self.assertIs(lst.insert(1, 5), lst.head.next)
+        self.check_dll([0, 5, 1], lst)
+
+        # (2) moves and unlink against a python list under every option
+        seed(331)
+        for options in ({}, {"indexed": True}, {"indexed": True, "indexable": True, "pool": NodePool()},
+                        {"fingerprint": True}, {"lazy_reverse": True}):
+            lst = DLL(**options)
+            nodes = [lst.push(randint(0, 9)) for _ in range(30)]
+            expected = [node.value for node in nodes]
+            for step in range(200):
+                if step % 50 == 25 and options.get("lazy_reverse"):
+                    lst.reverse()
+                    expected.reverse()
+                k = randint(0, len(nodes) - 1)
+                node = nodes[k]
+                i = next(j for j, other in enumerate(lst.iter_nodes()) if other is node)
+                op = randint(0, 2)
+                if op == 0:
+                    lst.move_to_front(node)
+                    expected.insert(0, expected.pop(i))
+                elif op == 1:
+                    lst.move_to_back(node)
+                    expected.append(expected.pop(i))
+                else:
+                    self.assertEqual(expected.pop(i), lst.unlink(node))
+                    nodes[k] = lst.push(randint(0, 9), back=bool(step % 2))
+                    if step % 2:
+                        expected.append(nodes[k].value)
+                    else:
+                        expected.insert(0, nodes[k].value)
+                self.assertEqual(expected, list(lst))
+            self.assertEqual(len(expected), lst.size)
+            lst.materialize()
+            self.check_dll(expected, lst)
+            fresh = DLL(**options)
+            fresh.list_to_dll(expected)
+            self.assertEqual(fresh.fingerprint(), lst.fingerprint())
+            if options.get("indexed"):
+                for val in set(expected):
+                    self.assertEqual([n for n in lst.iter_nodes() if n.value == val], lst.find_all(val))
+            if options.get("indexable"):
+                for i, val in enumerate(expected):
+                    self.assertEqual(val, lst[i].value)
+
+    def test_lru_cache(self):
+
+        # (1) get, put, eviction order and statistics
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(1, cache.get("a"))
+        cache.put("c", 3)  # evicts b, the least recently used
+        self.assertNotIn("b", cache)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual("x", cache.get("b", "x"))
+        cache.put("a", 10)  # update refreshes a, so c goes next
+        cache.put("d", 4)
+        self.assertEqual(["a", "d"], sorted(key for key in ("a", "b", "c", "d") if key in cache))
+        self.assertEqual(10, cache.get("a"))
+        self.assertEqual({"hits": 2, "misses": 2, "evictions": 2, "size": 2, "maxsize": 2}, cache.stats())
+        self.assertEqual("LRUCache(maxsize=2, size=2)", repr(cache))
+
+        # (2) pop, clear, edge sizes
+        self.assertEqual(4, cache.pop("d"))
+        self.assertIsNone(cache.pop("d"))
+        self.assertEqual(1, len(cache))
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        cache.put("e", 5)
+        self.assertEqual(5, cache.get("e"))
+        empty = LRUCache(0)
+        empty.put("a", 1)
+        self.assertEqual(0, len(empty))
+        with self.assertRaises(ValueError):
+            LRUCache(-1)
+
+        # (3) agrees with a python implementation
+        seed(331)
+        cache, model, evicted = LRUCache(8), [], 0
+        for _ in range(2000):
+            key = randint(0, 15)
+            if randint(0, 1):
+                hit = key in model
+                self.assertEqual(key * 2 if hit else None, cache.get(key))
+                if hit:
+                    model.remove(key)
+                    model.append(key)
+            else:
+                if key in model:
+                    model.remove(key)
+                elif len(model) == 8:
+                    model.pop(0)
+                    evicted += 1
+                model.append(key)
+                cache.put(key, key * 2)
+            self.assertEqual(len(model), len(cache))
+        self.assertEqual(model, [key for key, _ in cache._order])
+        self.assertEqual(evicted, cache.evictions)
+
+
+def _shared_worker(name, lock, tag):
+    dll = SharedDLL.attach(name, lock)
+    dll.push(tag)
+    dll.close()
+
 
 if __name__ == '__main__':
     unittest.main()